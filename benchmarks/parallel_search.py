@@ -0,0 +1,80 @@
+"""Branch and bound of day 16 and day 19 part 2 searched by 1, 2, 4... processes
+
+Day 16 lets the two workers open valves for 26 minutes, day 19 maximizes the geodes of the first
+blueprint in 32 minutes. Checks that every number of processes finds the same best value.
+
+    python -m benchmarks.parallel_search
+    python -m benchmarks.parallel_search --workers 1 2 3 4
+    python -m benchmarks.parallel_search --scale 12
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Optional
+
+from calendar import generators
+from calendar.calendar import Calendar
+from solutions import day19 as day19_solution
+
+
+def day16(solution, processes: int) -> float:
+    _, score = solution.find_best_permutation_before(end=26, first_valve='AA', workers=2, processes=processes)
+    return score
+
+
+def day19(solution, processes: int) -> float:
+    return day19_solution.find_max_geodes(next(iter(solution.blueprints.values())), 32, processes=processes)
+
+
+WORKLOADS = {16: day16, 19: day19}
+
+
+def measure(workload, solution, processes: int, repeats: int) -> tuple[float, float]:
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        best = workload(solution, processes)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings), best
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', help="Numbers of processes to compare, 1 first")
+    parser.add_argument('--repeats', type=int, default=1)
+    parser.add_argument('--scale', type=int, help="Use generated inputs of this size instead of the puzzle inputs")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    workers = args.workers or [1, *(2 ** power for power in range(1, cpu_count.bit_length()))]
+    if cpu_count not in workers and args.workers is None:
+        workers.append(cpu_count)
+
+    print(f"{cpu_count} CPUs")
+
+    for day, workload in WORKLOADS.items():
+        path: Optional[str] = None
+        if args.scale is not None:
+            path = str(generators.write_input(day, args.scale, args.seed))
+
+        solution = Calendar.parse(day, Calendar.read_input(day, path))
+        baseline, baseline_best = None, None
+
+        for processes in workers:
+            elapsed, best = measure(workload, solution, processes, args.repeats)
+            if baseline is None:
+                baseline, baseline_best = elapsed, best
+            elif best != baseline_best:
+                raise AssertionError(f"Day {day}: {processes} processes found {best}, expected {baseline_best}")
+
+            print(f"day {day:>2}: {processes:>3} workers {elapsed * 1000:9.1f} ms, "
+                  f"{baseline / elapsed:5.2f}x speedup, best {best:g}")
+
+
+if __name__ == '__main__':
+    main()
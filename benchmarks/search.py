@@ -0,0 +1,129 @@
+"""A* on the graphs of day 12 and day 16, heapq engine against the former PriorityQueue one
+
+Day 12 searches the height map from S to E, day 16 finds the distance between every pair of
+valves with a flow rate, as its solution does. Both check that the engines agree on every length.
+
+    python -m benchmarks.search --repeats 5
+    python -m benchmarks.search --scale 2000
+    python -m benchmarks.search --stats
+"""
+import argparse
+import itertools
+import math
+import statistics
+import time
+from dataclasses import dataclass, field, asdict
+from functools import partial
+from queue import PriorityQueue, Empty
+from typing import Callable, Iterable, Optional
+
+from calendar import generators
+from calendar.calendar import Calendar
+from itertoolsx import iter_except
+from search import a_star, Node, Path, PathNotFoundError, SearchStats, reconstruct_path
+
+
+@dataclass(order=True)
+class ScoredNode:
+    f_score: float
+    node: Node = field(compare=False)
+
+
+def legacy_a_star(
+        start: Node,
+        goal: Node,
+        neighbours: Callable[[Node], Iterable[Node]],
+        heuristic: Callable[[Node], float],
+        distance: Callable[[Node, Node], float]
+) -> Path[Node]:
+    open_set: PriorityQueue[ScoredNode] = PriorityQueue()
+    open_set.put_nowait(ScoredNode(heuristic(start), start))
+
+    came_from: dict[Node, Node] = {}
+    g_score = {start: 0}
+
+    for current_scored_node in iter_except(open_set.get_nowait, Empty):
+        current_node = current_scored_node.node
+        if current_node == goal:
+            nodes = reconstruct_path(came_from, current_node)
+            return Path(nodes, g_score.get(current_node))
+
+        for neighbour in neighbours(current_node):
+            tentative_g_score = g_score.get(current_node, math.inf) + distance(current_node, neighbour)
+            if tentative_g_score >= g_score.get(neighbour, math.inf):
+                continue
+
+            came_from[neighbour] = current_node
+            g_score[neighbour] = tentative_g_score
+            f_score = tentative_g_score + heuristic(neighbour)
+            scored_neighbour = ScoredNode(f_score, neighbour)
+
+            if neighbour in map(lambda scored: scored.node, open_set.queue):
+                continue
+
+            open_set.put_nowait(scored_neighbour)
+
+    raise PathNotFoundError(start, goal)
+
+
+def day12(engine, solution) -> list[float]:
+    path = engine(
+        solution.start_node, solution.goal_node,
+        solution.get_neighbours, solution.tile_heuristic, lambda tile1, tile2: 1
+    )
+    return [path.length]
+
+
+def day16(engine, solution) -> list[float]:
+    valves = ['AA', *solution.pressurized_valves]
+    return [
+        engine(start, end, solution.layout.__getitem__, lambda valve_id: 0, lambda valve1, valve2: 1).length
+        for start, end in itertools.combinations(valves, 2)
+    ]
+
+
+WORKLOADS = {12: day12, 16: day16}
+
+
+def measure(workload, engine, solution, repeats: int) -> tuple[float, list[float]]:
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        lengths = workload(engine, solution)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings), lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--scale', type=int, help="Use generated inputs of this size instead of the puzzle inputs")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--stats', action='store_true', help="Also show how much work the heapq engine does")
+    args = parser.parse_args()
+
+    for day, workload in WORKLOADS.items():
+        path: Optional[str] = None
+        if args.scale is not None:
+            path = str(generators.write_input(day, args.scale, args.seed))
+
+        solution = Calendar.parse(day, Calendar.read_input(day, path))
+
+        legacy, legacy_lengths = measure(workload, legacy_a_star, solution, args.repeats)
+        current, lengths = measure(workload, a_star, solution, args.repeats)
+        if lengths != legacy_lengths:
+            raise AssertionError(f"Day {day}: the engines disagree on the path lengths")
+
+        print(f"day {day:>2}: PriorityQueue {legacy * 1000:9.1f} ms, heapq {current * 1000:9.1f} ms, "
+              f"{legacy / current:5.1f}x faster")
+
+        if args.stats:
+            stats = SearchStats()
+            workload(partial(a_star, stats=stats), solution)
+            print('        ' + ', '.join(f"{name} {value:.4g}" for name, value in asdict(stats).items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Cold start time of Calendar.get for a single day
+
+Compares importing every solution module up front (the old eager registry)
+with importing only the requested day.
+
+    python -m benchmarks.startup --day 1 --repeats 10
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EAGER = """
+import importlib, pkgutil
+import solutions
+from calendar.calendar import Calendar
+for info in pkgutil.iter_modules(solutions.__path__):
+    importlib.import_module(f'solutions.{{info.name}}')
+Calendar.get(day={day})
+"""
+
+LAZY = """
+from calendar.calendar import Calendar
+Calendar.get(day={day})
+"""
+
+
+def cold_start(source: str, day: int) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', source.format(day=day)], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--day', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, source in [('eager', EAGER), ('lazy', LAZY)]:
+        timings = [cold_start(source, args.day) for _ in range(args.repeats)]
+        print(f"{name:>5}: median {statistics.median(timings) * 1000:8.1f} ms, min {min(timings) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
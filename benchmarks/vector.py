@@ -0,0 +1,61 @@
+"""Vector arithmetic of mathx against the former frozen dataclass Vector
+
+Times the operations the grid puzzles run millions of times: adding, subtracting, hashing and
+unpacking two coordinates, for Vector and the integer IntVector.
+
+    python -m benchmarks.vector --number 1000000
+"""
+import argparse
+import timeit
+from dataclasses import dataclass, astuple
+
+from mathx import Vector, IntVector
+
+
+@dataclass(frozen=True)
+class LegacyVector:
+    x: float
+    y: float
+
+    def __add__(self, other):
+        return LegacyVector(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        return LegacyVector(self.x - other.x, self.y - other.y)
+
+    def __iter__(self):
+        return iter(astuple(self))
+
+
+OPERATIONS = {
+    'add': 'a + b',
+    'sub': 'a - b',
+    'hash': 'hash(a)',
+    'unpack': 'x, y = a',
+    'build': 'vector(3, -1)'
+}
+
+
+def measure(vector, statement: str, number: int, repeats: int) -> float:
+    namespace = {'vector': vector, 'a': vector(3, -1), 'b': vector(-2, 5)}
+    return min(timeit.repeat(statement, globals=namespace, number=number, repeat=repeats)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200000, help="Operations per timing")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, statement in OPERATIONS.items():
+        legacy = measure(LegacyVector, statement, args.number, args.repeats)
+        timings = [measure(vector, statement, args.number, args.repeats) for vector in (Vector, IntVector)]
+
+        print(f"{name:<6}: dataclass {legacy * 1e9:7.1f} ns, " + ', '.join(
+            f"{vector.__name__} {timing * 1e9:7.1f} ns ({legacy / timing:4.1f}x)"
+            for vector, timing in zip((Vector, IntVector), timings)
+        ))
+
+
+if __name__ == '__main__':
+    main()
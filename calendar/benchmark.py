@@ -0,0 +1,174 @@
+import json
+import platform
+import statistics
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional, Sequence
+
+from calendar import generators
+from calendar.calendar import Calendar
+from calendar.runner import timed, format_duration
+
+BASELINE_VERSION = 1
+
+STATISTICS = ('min', 'median', 'p95')
+
+
+@dataclass
+class DayBenchmark:
+    day: int
+    scale: Optional[int] = None
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """The day, followed by the scale of its generated input if it didn't run on the real one"""
+        return str(self.day) if self.scale is None else f"{self.day}@{self.scale}"
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {phase: summarize(samples) for phase, samples in self.samples.items()}
+
+
+@dataclass
+class Regression:
+    label: str
+    phase: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def summarize(samples: Sequence[float]) -> dict[str, float]:
+    p95 = statistics.quantiles(samples, n=20, method='inclusive')[-1] if len(samples) > 1 else samples[0]
+    return {'min': min(samples), 'median': statistics.median(samples), 'p95': p95}
+
+
+def benchmark_day(day: int, parts: Sequence[int], warmup: int, repeats: int,
+                  scale: Optional[int] = None, seed: int = 0,
+                  options: Optional[Mapping[str, Any]] = None) -> DayBenchmark:
+    """Time parse and parts of a day, each repeat on a freshly read input and a fresh solution
+
+    With a scale the day runs on a generated input of that size instead of its real input.
+    """
+    benchmark = DayBenchmark(day, scale)
+
+    with redirect_stdout(sys.stderr):
+        try:
+            parser = Calendar.parser(day, options)
+            path = str(generators.write_input(day, scale, seed)) if scale is not None else None
+
+            for repeat in range(warmup + repeats):
+                timings: dict[str, float] = {}
+                solution = timed(timings, 'parse', parser, Calendar.read_input(day, path))
+                for part in parts:
+                    timed(timings, f'part{part}', getattr(solution, f'part{part}'))
+
+                if repeat < warmup:
+                    continue
+
+                for phase, elapsed in timings.items():
+                    benchmark.samples.setdefault(phase, []).append(elapsed)
+        except Exception as e:
+            traceback.print_exc()
+            benchmark.error = f"{type(e).__name__}: {e}"
+
+    return benchmark
+
+
+def benchmark(days: Sequence[int], parts: Sequence[int], warmup: int = 1, repeats: int = 5,
+              workers: int = 1, scales: Sequence[Optional[int]] = (None,), seed: int = 0,
+              options: Optional[Mapping[str, Any]] = None) -> list[DayBenchmark]:
+    """Benchmark days on their real input, or on generated inputs of each scale for runtime versus size curves"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(benchmark_day, day, parts, warmup, repeats, scale, seed, options)
+            for day in days
+            for scale in scales
+        ]
+        return [future.result() for future in futures]
+
+
+def create_baseline(benchmarks: Sequence[DayBenchmark], warmup: int, repeats: int) -> dict:
+    return {
+        'version': BASELINE_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'warmup': warmup,
+        'repeats': repeats,
+        'days': {
+            day_benchmark.label: day_benchmark.summary()
+            for day_benchmark in benchmarks
+            if day_benchmark.error is None
+        }
+    }
+
+
+def save_baseline(path: str, baseline: dict):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, indent=2)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {baseline.get('version')} in {path}")
+
+    return baseline
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_duration: float = 0.001) -> list[Regression]:
+    """Day/phase pairs whose median is slower than the baseline median by more than threshold (0.1 = 10%)
+
+    Phases faster than min_duration seconds are too noisy to gate on and are skipped.
+    """
+    regressions = []
+
+    for label, phases in current['days'].items():
+        for phase, stats in phases.items():
+            baseline_stats = baseline['days'].get(label, {}).get(phase, None)
+            if baseline_stats is None or baseline_stats['median'] <= 0:
+                continue
+
+            if stats['median'] < min_duration:
+                continue
+
+            regression = Regression(label, phase, baseline_stats['median'], stats['median'])
+            if regression.ratio > 1 + threshold:
+                regressions.append(regression)
+
+    return regressions
+
+
+def format_benchmarks(benchmarks: Sequence[DayBenchmark]) -> str:
+    lines = []
+
+    for day_benchmark in benchmarks:
+        if day_benchmark.error is not None:
+            lines.append(f"day {day_benchmark.label:>2}  {day_benchmark.error}")
+            continue
+
+        for phase, stats in day_benchmark.summary().items():
+            formatted_stats = '  '.join(f"{name} {format_duration(stats[name]):>9}" for name in STATISTICS)
+            lines.append(f"day {day_benchmark.label:>2}  {phase:<5}  {formatted_stats}")
+
+    return '\n'.join(lines)
+
+
+def format_regressions(regressions: Sequence[Regression]) -> str:
+    return '\n'.join(
+        f"day {regression.label:>2}  {regression.phase:<5}  "
+        f"{format_duration(regression.baseline)} -> {format_duration(regression.current)} "
+        f"({(regression.ratio - 1) * 100:+.0f}%)"
+        for regression in regressions
+    )
@@ -0,0 +1,240 @@
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from calendar.puzzle_input import PuzzleInput
+
+CACHE_DIRECTORY = Path('.cache')
+
+
+def imported_modules(module_name: str) -> Iterable[str]:
+    """Names of the modules a module imports anywhere in its source, with their parent packages"""
+    module = sys.modules[module_name]
+    with open(module.__file__, 'rb') as file:
+        tree = ast.parse(file.read())
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name('.' * node.level + (node.module or ''), module.__package__)
+            names = [base, *(f"{base}.{alias.name}" for alias in node.names)]
+        else:
+            continue
+
+        for name in names:
+            parts = name.split('.')
+            yield from ('.'.join(parts[:ind]) for ind in range(1, len(parts) + 1))
+
+
+def local_modules(module_name: str) -> list[Path]:
+    """Source files of a module and of every module of the repository it imports, directly or not
+
+    Only imported modules are followed, which once the module itself is imported are all it depends on.
+    """
+    top_level = sys.modules[module_name.partition('.')[0]]
+    root = Path(top_level.__file__).resolve().parent
+    if hasattr(top_level, '__path__'):
+        root = root.parent
+
+    pending, seen = [module_name], {module_name}
+    while pending:
+        for name in imported_modules(pending.pop()):
+            file = getattr(sys.modules.get(name, None), '__file__', None)
+            if name not in seen and file is not None and Path(file).resolve().is_relative_to(root):
+                seen.add(name)
+                pending.append(name)
+
+    return sorted(Path(sys.modules[name].__file__).resolve() for name in seen)
+
+
+def digest(puzzle_input: str | PuzzleInput, module_name: str, options: Optional[Mapping[str, Any]] = None) -> str:
+    """Content address of a day: the SHA-256 of its input followed by the source of its solution module
+
+    The source of the modules of the repository it imports is hashed too, so a change to a shared
+    module like mathx or search also changes the address of every day using it. So are the options
+    its solution is created with, a day solved by another engine gets an address of its own.
+    """
+    sha = hashlib.sha256()
+    if isinstance(puzzle_input, PuzzleInput):
+        with puzzle_input.mapped() as buffer:
+            sha.update(buffer)
+    else:
+        sha.update(puzzle_input.encode('utf-8'))
+
+    for path in local_modules(module_name):
+        with open(path, 'rb') as file:
+            sha.update(file.read())
+
+    if options:
+        sha.update(repr(sorted(options.items())).encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+def write_atomically(path: Path, data: bytes):
+    """Write through a temporary file so concurrent readers never see a partial entry"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary_path.write_bytes(data)
+    os.replace(temporary_path, path)
+
+
+@dataclass
+class ParseCache:
+    """Pickled solutions right after parsing, evicted least recently used first once max_size bytes are exceeded"""
+    directory: Path = field(default=CACHE_DIRECTORY / 'parsed')
+    max_size: int = 512 * 2 ** 20
+
+    def path(self, day: int, key: str) -> Path:
+        return self.directory / f"day{day}-{key}.pickle"
+
+    def entries(self, days: Optional[Iterable[int]] = None) -> list[Path]:
+        if not self.directory.exists():
+            return []
+
+        if days is None:
+            return list(self.directory.glob('day*.pickle'))
+
+        return [path for day in days for path in self.directory.glob(f'day{day}-*.pickle')]
+
+    def load(self, day: int, key: str) -> Optional[Any]:
+        path = self.path(day, key)
+
+        try:
+            with open(path, 'rb') as file:
+                solution = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A corrupt entry, or one pickled from classes that have changed since, is a miss
+            path.unlink(missing_ok=True)
+            return None
+
+        # The modification time doubles as the last access time for eviction
+        os.utime(path)
+        return solution
+
+    def store(self, day: int, key: str, solution: Any) -> bool:
+        try:
+            data = pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            # Solutions holding lambdas or other unpicklable state simply aren't cached
+            return False
+
+        write_atomically(self.path(day, key), data)
+
+        self.evict()
+        return True
+
+    def evict(self):
+        entries = sorted(
+            ((entry, entry.stat()) for entry in self.entries()),
+            key=lambda entry_stat: entry_stat[1].st_mtime
+        )
+        total_size = sum(stat.st_size for _, stat in entries)
+
+        for entry, stat in entries:
+            if total_size <= self.max_size:
+                break
+
+            entry.unlink(missing_ok=True)
+            total_size -= stat.st_size
+
+    def invalidate(self, days: Optional[Iterable[int]] = None) -> int:
+        entries = self.entries(days)
+
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+
+        return len(entries)
+
+
+@dataclass
+class Answer:
+    answer: Any
+    elapsed: float
+    created: float
+
+
+@dataclass
+class AnswerStats:
+    hits: int = 0
+    misses: int = 0
+    saved: float = 0.0
+
+
+@dataclass
+class AnswerStore:
+    """Answers of parts under the same content address as parsed state, with the time they took to compute"""
+    directory: Path = field(default=CACHE_DIRECTORY / 'answers')
+
+    def path(self, day: int, part: int, key: str) -> Path:
+        return self.directory / f"day{day}-part{part}-{key}.pickle"
+
+    def stats_path(self, day: int, part: int) -> Path:
+        return self.directory / f"day{day}-part{part}.stats.json"
+
+    def entries(self, days: Optional[Iterable[int]] = None) -> list[Path]:
+        if not self.directory.exists():
+            return []
+
+        patterns = ['day*'] if days is None else [f'day{day}-*' for day in days]
+        return [path for pattern in patterns for path in self.directory.glob(pattern)]
+
+    def stats(self, day: int, part: int) -> AnswerStats:
+        try:
+            return AnswerStats(**json.loads(self.stats_path(day, part).read_text(encoding='utf-8')))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return AnswerStats()
+
+    def update_stats(self, day: int, part: int, hits: int = 0, misses: int = 0, saved: float = 0.0):
+        stats = self.stats(day, part)
+        stats.hits += hits
+        stats.misses += misses
+        stats.saved += saved
+
+        write_atomically(self.stats_path(day, part), json.dumps(asdict(stats)).encode('utf-8'))
+
+    def load(self, day: int, part: int, key: str) -> Optional[Answer]:
+        path = self.path(day, part, key)
+
+        try:
+            with open(path, 'rb') as file:
+                answer = pickle.load(file)
+        except FileNotFoundError:
+            self.update_stats(day, part, misses=1)
+            return None
+        except Exception:
+            # Answers can be instances of repository classes too, ones that may have changed since
+            path.unlink(missing_ok=True)
+            self.update_stats(day, part, misses=1)
+            return None
+
+        self.update_stats(day, part, hits=1, saved=answer.elapsed)
+        return answer
+
+    def store(self, day: int, part: int, key: str, answer: Any, elapsed: float) -> bool:
+        try:
+            data = pickle.dumps(Answer(answer, elapsed, time.time()), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+
+        write_atomically(self.path(day, part, key), data)
+        return True
+
+    def invalidate(self, days: Optional[Iterable[int]] = None) -> int:
+        entries = self.entries(days)
+
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+
+        return len(entries)
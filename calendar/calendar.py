@@ -1,7 +1,25 @@
-from typing import Protocol, Any, Callable
+import functools
+import importlib
+import inspect
+import pkgutil
+import re
+from typing import Protocol, Any, Callable, Mapping, Optional
+
+from calendar.cache import ParseCache, digest
+from calendar.puzzle_input import PuzzleInput
 
 
 class Solution(Protocol):
+    """The solution of a day
+
+    Creating it is the parse stage, see Calendar.parse: the parse class method of the solution
+    if it has one, else constructing it from the input. The created solution is the parsed model
+    of the puzzle and is left untouched afterwards: parts only read it, so they can run in either
+    order, concurrently or on unpickled copies of the same parse.
+    """
+
+    # Optional, def parse(cls, puzzle_input: str | PuzzleInput) -> Solution as a class method
+
     def part1(self) -> Any:
         ...
 
@@ -9,29 +27,124 @@ class Solution(Protocol):
         ...
 
 
-SolutionTemplate = Callable[[str], Solution]
+SolutionTemplate = Callable[[str | PuzzleInput], Solution]
 
 
 class Calendar:
     solutions: dict[int, SolutionTemplate] = {}
+    streaming: set[int] = set()
+    parallel: set[int] = set()
+    package: str = 'solutions'
 
     @classmethod
-    def get(cls, day: int):
+    def days(cls) -> list[int]:
+        """Days that have a solution module, discovered by the dayN naming convention without importing them"""
+        package = importlib.import_module(cls.package)
+        matches = (re.fullmatch('day(\\d+)', info.name) for info in pkgutil.iter_modules(package.__path__))
+        return sorted(int(match[1]) for match in matches if match)
+
+    @classmethod
+    def load(cls, day: int) -> SolutionTemplate:
+        """Import the module of a single day on first use, which registers its solution"""
         solution = cls.solutions.get(day, None)
+        if solution is not None:
+            return solution
 
+        module_name = f"{cls.package}.day{day}"
+        try:
+            importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+
+        solution = cls.solutions.get(day, None)
         if solution is None:
             raise KeyError(f"There isn't a solution for day {day}")
 
-        with open(f"inputs/input{day}.txt", encoding='utf-8') as file:
-            puzzle_input = file.read()
+        return solution
+
+    @classmethod
+    def open_input(cls, day: int, path: Optional[str] = None) -> PuzzleInput:
+        return PuzzleInput(path or f"inputs/input{day}.txt")
+
+    @classmethod
+    def read_input(cls, day: int, path: Optional[str] = None) -> str | PuzzleInput:
+        """The input of a day in the form its solution takes: a lazy handle for streaming days, else the whole text"""
+        cls.load(day)
+        puzzle_input = cls.open_input(day, path)
+
+        if day in cls.streaming:
+            return puzzle_input
+
+        return puzzle_input.text
+
+    @classmethod
+    def options(cls, day: int, options: Optional[Mapping[str, Any]] = None) -> dict[str, Any]:
+        """The options a day's parse stage takes, like the solver of day 16, out of those given for every day
+
+        Options given their default value are left out, so they don't change the address of the day.
+        """
+        template = cls.load(day)
+        parameters = inspect.signature(getattr(template, 'parse', template)).parameters
+        return {
+            name: value for name, value in (options or {}).items()
+            if name in parameters and parameters[name].default != value
+        }
+
+    @classmethod
+    def key(cls, day: int, puzzle_input: str | PuzzleInput, options: Optional[Mapping[str, Any]] = None) -> str:
+        """Content address of a day's input, of the source it runs and of the options it takes, shared by the parse
+        cache and the answer store"""
+        return digest(puzzle_input, cls.load(day).__module__, cls.options(day, options))
+
+    @classmethod
+    def parser(cls, day: int, options: Optional[Mapping[str, Any]] = None) -> SolutionTemplate:
+        """The parse stage of a day: the parse class method of its solution, or else the solution itself
+
+        Options the parse stage takes are bound to it, the others are ignored so the same options can be
+        given to every day.
+        """
+        template = cls.load(day)
+        parser = getattr(template, 'parse', template)
+        options = cls.options(day, options)
+        return functools.partial(parser, **options) if options else parser
+
+    @classmethod
+    def parse(cls, day: int, puzzle_input: str | PuzzleInput, cache: Optional[ParseCache] = None,
+              key: Optional[str] = None, options: Optional[Mapping[str, Any]] = None) -> Solution:
+        """Create the solution of a day, reusing a cached parse of the same input and solution source if possible"""
+        parser = cls.parser(day, options)
+        if cache is None:
+            return parser(puzzle_input)
+
+        key = key or cls.key(day, puzzle_input, options)
+        solution = cache.load(day, key)
+        if solution is None:
+            solution = parser(puzzle_input)
+            cache.store(day, key, solution)
+
+        return solution
 
-        return solution(puzzle_input)
+    @classmethod
+    def get(cls, day: int, cache: Optional[ParseCache] = None) -> Solution:
+        return cls.parse(day, cls.read_input(day), cache)
 
     @classmethod
-    def register(cls, day: int):
+    def register(cls, day: int, streaming: bool = False, parallel: bool = False):
+        """Register the solution of a day
+
+        Streaming solutions take a PuzzleInput instead of the text. Parallel solutions open a process
+        pool of their own in their parts and size it by calendar.scheduler.worker_budget().
+        """
         def wrapper(template: SolutionTemplate):
             cls.solutions[day] = template
 
-        return  wrapper
+            if streaming:
+                cls.streaming.add(day)
 
+            if parallel:
+                cls.parallel.add(day)
 
+            return template
+
+        return  wrapper
@@ -0,0 +1,454 @@
+"""Seeded generators of valid puzzle inputs at a requested scale
+
+The scale is the number of the day's main items: lines, moves, cells, items, sensors, valves, cubes,
+blueprints, numbers or monkeys. The same day, scale and seed always give the same input.
+"""
+import functools
+import hashlib
+import itertools
+import math
+import string
+from pathlib import Path
+from random import Random
+from typing import Callable, Iterator, Optional
+
+from calendar.cache import CACHE_DIRECTORY
+
+Generator = Callable[[int, Random], Iterator[str]]
+
+GENERATED_DIRECTORY = CACHE_DIRECTORY / 'generated'
+
+generators: dict[int, Generator] = {}
+
+
+def register(day: int):
+    def wrapper(generator: Generator):
+        generators[day] = generator
+        return generator
+
+    return wrapper
+
+
+def generate(day: int, scale: int, seed: int = 0) -> Iterator[str]:
+    """Lines of a generated input for a day"""
+    generator = generators.get(day, None)
+    if generator is None:
+        raise KeyError(f"There isn't an input generator for day {day}")
+
+    return generator(scale, Random(seed))
+
+
+@functools.cache
+def source_digest() -> str:
+    """Short digest of this module, so inputs generated before a generator changed aren't reused"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+
+def write_input(day: int, scale: int, seed: int = 0, path: Optional[Path] = None) -> Path:
+    """Write a generated input to a file
+
+    Without a path it goes to the generated inputs directory, under a name made of the day, scale, seed
+    and the digest of the generators' source, and is reused if it was generated before. A given path is
+    always written.
+    """
+    if path is None:
+        path = GENERATED_DIRECTORY / f"input{day}-{scale}-{seed}-{source_digest()}.txt"
+        if path.exists():
+            return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        file.writelines(f"{line}\n" for line in generate(day, scale, seed))
+
+    temporary_path.replace(path)
+    return path
+
+
+def primes() -> Iterator[int]:
+    found: list[int] = []
+
+    for candidate in itertools.count(2):
+        if all(candidate % prime for prime in itertools.takewhile(lambda prime: prime * prime <= candidate, found)):
+            found.append(candidate)
+            yield candidate
+
+
+def names(length: int, excluded: set[str] = frozenset()) -> Iterator[str]:
+    return (
+        name
+        for name in map(''.join, itertools.product(string.ascii_lowercase, repeat=length))
+        if name not in excluded
+    )
+
+
+@register(day=1)
+def elf_inventories(scale: int, rng: Random) -> Iterator[str]:
+    lines = 0
+
+    while lines < scale:
+        inventory_size = rng.randint(1, 10)
+        yield from (str(rng.randint(1000, 60000)) for _ in range(inventory_size))
+        yield ''
+        lines += inventory_size + 1
+
+
+@register(day=2)
+def strategy_guide(scale: int, rng: Random) -> Iterator[str]:
+    for _ in range(scale):
+        yield f"{rng.choice('ABC')} {rng.choice('XYZ')}"
+
+
+@register(day=3)
+def rucksacks(scale: int, rng: Random) -> Iterator[str]:
+    """Groups of three rucksacks sharing exactly one badge, each with exactly one item in both compartments"""
+    for _ in range(math.ceil(scale / 3)):
+        badge = rng.choice(string.ascii_letters)
+        others = [letter for letter in string.ascii_letters if letter != badge]
+        rng.shuffle(others)
+
+        for pool in (others[0:17], others[17:34], others[34:51]):
+            misplaced = rng.choice(pool)
+            rest = [letter for letter in pool if letter != misplaced]
+            size = rng.randint(4, 16)
+
+            left = [misplaced, badge, *rng.choices(rest[:8], k=size - 2)]
+            right = [misplaced, *rng.choices(rest[8:], k=size - 1)]
+            rng.shuffle(left)
+            rng.shuffle(right)
+
+            yield ''.join(left + right)
+
+
+@register(day=4)
+def section_assignments(scale: int, rng: Random) -> Iterator[str]:
+    def assignment() -> str:
+        start = rng.randint(1, 99)
+        return f"{start}-{rng.randint(start, 99)}"
+
+    for _ in range(scale):
+        yield f"{assignment()},{assignment()}"
+
+
+@register(day=5)
+def crate_moves(scale: int, rng: Random) -> Iterator[str]:
+    stack_count = 9
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(2, 8))]
+        for _ in range(stack_count)
+    ]
+
+    for height in range(max(map(len, stacks)), 0, -1):
+        yield ' '.join(f"[{stack[height - 1]}]" if len(stack) >= height else '   ' for stack in stacks)
+
+    yield ' '.join(f" {stack_id} " for stack_id in range(1, stack_count + 1))
+    yield ''
+
+    # Every stack keeps at least one crate so there is always a top crate to read
+    sizes = list(map(len, stacks))
+    for _ in range(scale):
+        source = rng.choice([stack_id for stack_id, size in enumerate(sizes) if size > 1])
+        destination = rng.choice([stack_id for stack_id in range(stack_count) if stack_id != source])
+        crates = rng.randint(1, sizes[source] - 1)
+        sizes[source] -= crates
+        sizes[destination] += crates
+
+        yield f"move {crates} from {source + 1} to {destination + 1}"
+
+
+@register(day=6)
+def datastream(scale: int, rng: Random) -> Iterator[str]:
+    """Three letters for most of the stream so neither marker shows up before its end"""
+    marker = 'defghijklmnopq'
+    yield ''.join(rng.choices('abc', k=max(0, scale - len(marker)))) + marker
+
+
+@register(day=7)
+def terminal_output(scale: int, rng: Random) -> Iterator[str]:
+    directories: list[dict] = [{}]
+
+    for ind in range(scale):
+        parent = rng.choice(directories)
+        if rng.random() < 0.2:
+            directory = {}
+            parent[f"d{ind}"] = directory
+            directories.append(directory)
+        else:
+            parent[f"f{ind}.txt"] = rng.randint(1000, 300000)
+
+    def browse(directory: dict) -> Iterator[str]:
+        yield '$ ls'
+        for name, content in directory.items():
+            yield f"dir {name}" if isinstance(content, dict) else f"{content} {name}"
+
+        for name, content in directory.items():
+            if isinstance(content, dict):
+                yield f"$ cd {name}"
+                yield from browse(content)
+                yield '$ cd ..'
+
+    yield '$ cd /'
+    yield from browse(directories[0])
+
+
+@register(day=8)
+def tree_heights(scale: int, rng: Random) -> Iterator[str]:
+    side = max(2, math.isqrt(scale))
+    for _ in range(side):
+        yield ''.join(rng.choices(string.digits, k=side))
+
+
+@register(day=9)
+def rope_moves(scale: int, rng: Random) -> Iterator[str]:
+    for _ in range(scale):
+        yield f"{rng.choice('LRUD')} {rng.randint(1, 20)}"
+
+
+@register(day=10)
+def instructions(scale: int, rng: Random) -> Iterator[str]:
+    # Part 1 samples the register up to cycle 220
+    for _ in range(max(scale, 220)):
+        yield 'noop' if rng.random() < 0.3 else f"addx {rng.randint(-5, 5)}"
+
+
+@register(day=11)
+def monkeys(scale: int, rng: Random) -> Iterator[str]:
+    """Eight monkeys like in a real input, holding scale items between them, at least one each
+
+    More monkeys would make the product of their moduli, which part 2 keeps worry levels under, grow
+    with the scale as well.
+    """
+    monkey_count = 8
+    item_counts = [1] * monkey_count
+    for _ in range(max(0, scale - monkey_count)):
+        item_counts[rng.randrange(monkey_count)] += 1
+
+    moduli = itertools.islice(primes(), monkey_count)
+
+    for monkey_id, (modulus, item_count) in enumerate(zip(moduli, item_counts)):
+        other_monkeys = [other_id for other_id in range(monkey_count) if other_id != monkey_id]
+        worry_levels = ', '.join(str(rng.randint(50, 99)) for _ in range(item_count))
+        operation = rng.choice([f"old * {rng.randint(2, 19)}", f"old + {rng.randint(1, 8)}", "old * old"])
+
+        yield f"Monkey {monkey_id}:"
+        yield f"  Starting items: {worry_levels}"
+        yield f"  Operation: new = {operation}"
+        yield f"  Test: divisible by {modulus}"
+        yield f"    If true: throw to monkey {rng.choice(other_monkeys)}"
+        yield f"    If false: throw to monkey {rng.choice(other_monkeys)}"
+        yield ''
+
+
+@register(day=12)
+def height_map(scale: int, rng: Random) -> Iterator[str]:
+    """A slope from S in the top left to E in the bottom right, rough everywhere but the top row and last column"""
+    width = max(26, math.isqrt(2 * scale))
+    height = max(2, scale // width)
+    step = max(1, (width + height) // 26)
+
+    for y in range(height):
+        row = []
+        for x in range(width):
+            elevation = min(25, (x + y) // step)
+            if y > 0 and x < width - 1 and rng.random() < 0.2:
+                elevation = max(0, elevation - rng.randint(1, 3))
+
+            row.append(string.ascii_lowercase[elevation])
+
+        # The corners are a and z by construction
+        if y == 0:
+            row[0] = 'S'
+        if y == height - 1:
+            row[-1] = 'E'
+
+        yield ''.join(row)
+
+
+@register(day=13)
+def packet_pairs(scale: int, rng: Random) -> Iterator[str]:
+    def packet(depth: int) -> str:
+        items = (
+            packet(depth + 1) if depth < 4 and rng.random() < 0.3 else str(rng.randint(0, 10))
+            for _ in range(rng.randint(0, 5))
+        )
+        return f"[{','.join(items)}]"
+
+    for _ in range(scale):
+        yield packet(0)
+        yield packet(0)
+        yield ''
+
+
+@register(day=14)
+def rock_paths(scale: int, rng: Random) -> Iterator[str]:
+    """Rock scattered below a band that is left clear under the source, so the sand has room to pile up
+
+    The cave is deep and wide enough for the rock to leave gaps, through which sand falls into the abyss.
+    """
+    depth = 10 + 6 * math.isqrt(scale)
+    top = depth // 3
+
+    for _ in range(scale):
+        x, y = 500 + rng.randint(-depth, depth), rng.randint(top, depth)
+        points = [(x, y)]
+
+        for ind in range(rng.randint(1, 4)):
+            if ind % 2 == 0:
+                x = max(0, x + rng.choice([-1, 1]) * rng.randint(1, 8))
+            else:
+                y = min(depth, max(top, y + rng.choice([-1, 1]) * rng.randint(1, 8)))
+
+            points.append((x, y))
+
+        yield ' -> '.join(f"{x},{y}" for x, y in points)
+
+
+@register(day=15)
+def sensors(scale: int, rng: Random) -> Iterator[str]:
+    size = 4000000
+    reach = 4 * size // max(1, math.isqrt(scale))
+
+    for _ in range(scale):
+        sensor_x, sensor_y = rng.randint(0, size), rng.randint(0, size)
+        beacon_x = sensor_x + rng.randint(-reach, reach)
+        beacon_y = sensor_y + rng.randint(-reach, reach)
+
+        yield f"Sensor at x={sensor_x}, y={sensor_y}: closest beacon is at x={beacon_x}, y={beacon_y}"
+
+
+@register(day=16)
+def valves(scale: int, rng: Random) -> Iterator[str]:
+    """A connected tunnel network with AA first, a quarter of its valves release pressure
+
+    Beyond 15 + the square root of the number of valves they grow only as fast as that, the search for
+    which to open is exponential in them. A real input has about 60 valves and 15 release pressure.
+    """
+    valve_count = max(2, scale)
+    name_length = 2 if valve_count <= 26 ** 2 else math.ceil(math.log(valve_count, 26))
+    valve_ids = ['AA', *(name.upper() for name in itertools.islice(names(name_length, {'aa'}), valve_count - 1))]
+
+    tunnels: dict[str, set[str]] = {valve_id: set() for valve_id in valve_ids}
+    for ind, valve_id in enumerate(valve_ids[1:], 1):
+        for other_id in {rng.choice(valve_ids[:ind]) for _ in range(rng.randint(1, 2))}:
+            tunnels[valve_id].add(other_id)
+            tunnels[other_id].add(valve_id)
+
+    pressurized = set(rng.sample(valve_ids[1:], max(1, min(valve_count // 4, 15 + math.isqrt(valve_count)))))
+
+    for valve_id in valve_ids:
+        flow_rate = rng.randint(3, 25) if valve_id in pressurized else 0
+        neighbours = sorted(tunnels[valve_id])
+        if len(neighbours) == 1:
+            yield f"Valve {valve_id} has flow rate={flow_rate}; tunnel leads to valve {neighbours[0]}"
+        else:
+            yield f"Valve {valve_id} has flow rate={flow_rate}; tunnels lead to valves {', '.join(neighbours)}"
+
+
+@register(day=17)
+def jet_pattern(scale: int, rng: Random) -> Iterator[str]:
+    """Jets repeat with a bounded period, part 2 needs the tower to settle into a cycle within 5000 rocks"""
+    period = ''.join(rng.choices('<>', k=min(scale, 1000)))
+    yield (period * math.ceil(scale / len(period)))[:scale]
+
+
+@register(day=18)
+def lava_cubes(scale: int, rng: Random) -> Iterator[str]:
+    side = max(2, round((2 * scale) ** (1 / 3)))
+    cubes: set[tuple[int, int, int]] = set()
+
+    while len(cubes) < min(scale, side ** 3):
+        cubes.add((rng.randint(1, side), rng.randint(1, side), rng.randint(1, side)))
+
+    for x, y, z in cubes:
+        yield f"{x},{y},{z}"
+
+
+@register(day=19)
+def blueprints(scale: int, rng: Random) -> Iterator[str]:
+    for blueprint_id in range(1, max(3, scale) + 1):
+        yield (
+            f"Blueprint {blueprint_id}: "
+            f"Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian."
+        )
+
+
+@register(day=20)
+def encrypted_file(scale: int, rng: Random) -> Iterator[str]:
+    # Mixing moves numbers modulo one less than the count, which needs at least two of them
+    count = max(2, scale)
+    zero_ind = rng.randrange(count)
+
+    for ind in range(count):
+        yield '0' if ind == zero_ind else str(rng.choice([-1, 1]) * rng.randint(1, 10000))
+
+
+@register(day=21)
+def monkey_math(scale: int, rng: Random) -> Iterator[str]:
+    """An expression tree with humn as one of its leaves, combined at root with +
+
+    Multiplication and division only ever take a nonzero number on their right, so part 2 never has
+    to divide by zero or solve a non-linear equation. Every monkey yells a * humn + b for integers a
+    and b, divisions are only by common divisors of the two and the side without humn is adjusted at
+    the end, so both answers are integers like in a real input.
+    """
+    name_length = 4 if scale < 26 ** 4 // 2 else 5
+    monkey_names = names(name_length, excluded={'root', 'humn'})
+    lines = [f"humn: {rng.randint(1, 20)}"]
+    forms = {'humn': (1, 0)}
+    pool = ['humn']
+
+    def number(value: Optional[int] = None) -> str:
+        name = next(monkey_names)
+        value = rng.randint(1, 20) if value is None else value
+        lines.append(f"{name}: {value}")
+        forms[name] = (0, value)
+        return name
+
+    def combine(left: str, operation: str, right: str) -> str:
+        name = next(monkey_names)
+        lines.append(f"{name}: {left} {operation} {right}")
+        (left_a, left_b), (right_a, right_b) = forms[left], forms[right]
+        match operation:
+            case '+':
+                forms[name] = (left_a + right_a, left_b + right_b)
+            case '-':
+                forms[name] = (left_a - right_a, left_b - right_b)
+            case '*':
+                forms[name] = (left_a * right_b, left_b * right_b)
+            case '/':
+                forms[name] = (left_a // right_b, left_b // right_b)
+        return name
+
+    def take_random() -> str:
+        ind = rng.randrange(len(pool))
+        pool[ind], pool[-1] = pool[-1], pool[ind]
+        return pool.pop()
+
+    # A third of the monkeys are leaves, merging random pairs of subtrees keeps the tree shallow
+    pool.extend(number() for _ in range(max(1, scale // 3)))
+
+    while len(pool) > 2:
+        if rng.random() < 1 / 3:
+            left = take_random()
+            divisors = [divisor for divisor in range(2, 21) if math.gcd(*forms[left]) % divisor == 0]
+            if divisors and rng.random() < 0.5:
+                pool.append(combine(left, '/', number(rng.choice(divisors))))
+            else:
+                pool.append(combine(left, '*', number()))
+        else:
+            left, right = take_random(), take_random()
+            pool.append(combine(left, rng.choice('+-'), right))
+
+    # Make the side without humn equal to the other one for a humn of our choosing
+    unknown, known = sorted(pool, key=lambda name: forms[name][0] == 0)
+    (a, b), (_, c) = forms[unknown], forms[known]
+    difference = a * rng.randint(1, 10000) + b - c
+    if difference:
+        known = combine(known, '+' if difference > 0 else '-', number(abs(difference)))
+
+    lines.append(f"root: {unknown} + {known}")
+    rng.shuffle(lines)
+    yield from lines
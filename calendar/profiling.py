@@ -0,0 +1,79 @@
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Sequence, TypeVar
+
+from calendar.calendar import Calendar
+from calendar.runner import format_duration
+
+_T = TypeVar('_T')
+
+PROFILE_DIRECTORY = Path('profiles')
+
+
+@dataclass
+class PhaseProfile:
+    day: int
+    phase: str
+    elapsed: float
+    peak_memory: int
+    profile_path: Path
+    report: str
+
+    def __str__(self):
+        return (
+            f"day {self.day} {self.phase}: {format_duration(self.elapsed)}, "
+            f"peak memory {self.peak_memory / 2 ** 20:.1f} MiB, profile written to {self.profile_path}\n"
+            f"{self.report}"
+        )
+
+
+def profile_phase(day: int, phase: str, func: Callable[..., _T], *args: Any,
+                  top: int, directory: Path) -> tuple[_T, PhaseProfile]:
+    """Run a single phase under cProfile and tracemalloc, both of which slow it down noticeably"""
+    profiler = cProfile.Profile()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        value = func(*args)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_path = directory / f"day{day}-{phase}.prof"
+    profiler.dump_stats(profile_path)
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    return value, PhaseProfile(day, phase, elapsed, peak_memory, profile_path, report.getvalue().strip())
+
+
+def profile_day(day: int, parts: Sequence[int], top: int = 20, directory: Path = PROFILE_DIRECTORY,
+                options: Optional[Mapping[str, Any]] = None) -> list[PhaseProfile]:
+    """Profile parsing and each part of a day separately"""
+    profiles = []
+
+    with redirect_stdout(sys.stderr):
+        puzzle_input = Calendar.read_input(day)
+        solution, profile = profile_phase(
+            day, 'parse', Calendar.parser(day, options), puzzle_input, top=top, directory=directory
+        )
+        profiles.append(profile)
+
+        for part in parts:
+            _, profile = profile_phase(day, f'part{part}', getattr(solution, f'part{part}'), top=top, directory=directory)
+            profiles.append(profile)
+
+    return profiles
@@ -0,0 +1,78 @@
+import io
+import mmap
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Iterator, Optional
+
+
+class PuzzleInput:
+    """Lazy handle on a puzzle input
+
+    Nothing is read until it is asked for: text reads the whole input as a str,
+    buffer maps the file into memory without copying it and lines() streams it
+    line by line. The map of buffer stays open as long as the input, mapped()
+    maps the file for a with block only.
+    """
+
+    def __init__(self, path: Optional[str] = None, *_, text: Optional[str] = None):
+        if (path is None) == (text is None):
+            raise ValueError("A puzzle input needs either a path or a text")
+
+        self.path = path
+
+        if text is not None:
+            self.text = text
+
+    @classmethod
+    def from_text(cls, text: str) -> 'PuzzleInput':
+        return cls(text=text)
+
+    @cached_property
+    def text(self) -> str:
+        with open(self.path, encoding='utf-8') as file:
+            return file.read()
+
+    @cached_property
+    def buffer(self) -> memoryview:
+        if self.path is None:
+            return memoryview(self.text.encode('utf-8'))
+
+        with open(self.path, 'rb') as file:
+            try:
+                return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            except ValueError:
+                # Empty files can't be mapped
+                return memoryview(b'')
+
+    @contextmanager
+    def mapped(self) -> Iterator[memoryview]:
+        """The input mapped into memory without copying it, the map is closed when the with block ends"""
+        if self.path is None:
+            yield memoryview(self.text.encode('utf-8'))
+            return
+
+        with open(self.path, 'rb') as file:
+            try:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                yield memoryview(b'')
+                return
+
+        with mapping, memoryview(mapping) as buffer:
+            yield buffer
+
+    def lines(self) -> Iterator[str]:
+        """Lines without their line endings, like str.splitlines"""
+        with open(self.path, encoding='utf-8') if self.path is not None else io.StringIO(self.text) as file:
+            for line in file:
+                yield line.rstrip('\r\n')
+
+    def __reduce__(self):
+        if self.path is None:
+            return PuzzleInput.from_text, (self.text,)
+
+        return PuzzleInput, (self.path,)
+
+    def __str__(self) -> str:
+        return self.text
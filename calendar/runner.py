@@ -0,0 +1,253 @@
+import json
+import os
+import pickle
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout, contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Mapping, Optional, Sequence, TypeVar
+
+from calendar.cache import ParseCache, AnswerStore
+from calendar.calendar import Calendar, Solution
+from calendar.scheduler import Job, RuntimeHistory, Scheduler
+
+_T = TypeVar('_T')
+
+PHASES = ('load', 'parse', 'part1', 'part2')
+
+
+@dataclass
+class DayResult:
+    day: int
+    timings: dict[str, float] = field(default_factory=dict)
+    answers: dict[int, str] = field(default_factory=dict)
+    memoized: list[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def parse_selection(selection: str) -> list[int]:
+    """Parse a selection like '1-5,8,10-12' into a sorted list of numbers"""
+    numbers: set[int] = set()
+
+    for item in filter(None, map(str.strip, selection.split(','))):
+        start, _, end = item.partition('-')
+        numbers.update(range(int(start), int(end or start) + 1))
+
+    return sorted(numbers)
+
+
+def timed(timings: dict[str, float], phase: str, func: Callable[..., _T], *args: Any) -> _T:
+    start = time.perf_counter()
+    value = func(*args)
+    timings[phase] = time.perf_counter() - start
+    return value
+
+
+@dataclass
+class ParsedDay:
+    """A day after its parse stage: the parts left to run and the pickled parsed state they share"""
+    result: DayResult
+    key: Optional[str] = None
+    remaining_parts: list[int] = field(default_factory=list)
+    solution: Optional[bytes] = None
+    parallel: bool = False
+
+
+@contextmanager
+def reporting_errors(result: DayResult):
+    # Solutions print debug output, keep it out of the report on stdout
+    with redirect_stdout(sys.stderr):
+        try:
+            yield
+        except Exception as e:
+            traceback.print_exc()
+            result.error = f"{type(e).__name__}: {e}"
+
+
+def solve_parts(result: DayResult, solution: Solution, parts: Sequence[int], key: Optional[str],
+                store: Optional[AnswerStore]):
+    for part in parts:
+        answer = timed(result.timings, f'part{part}', getattr(solution, f'part{part}'))
+        result.answers[part] = str(answer)
+
+        if store is not None:
+            store.store(result.day, part, key, answer, result.timings[f'part{part}'])
+
+
+def parse_day(day: int, parts: Sequence[int], cache: Optional[ParseCache] = None,
+              store: Optional[AnswerStore] = None, options: Optional[Mapping[str, Any]] = None) -> ParsedDay:
+    """Load and parse a day, answering from the store where possible and only parsing if some part is left
+
+    When more than one part is left, or the day is parallel, the parsed state is handed back pickled so
+    the parts can run as jobs of their own, in separate workers and with a worker budget for the parallel
+    ones. Solutions that can't be pickled run their parts right here instead.
+    """
+    parsed_day = ParsedDay(DayResult(day))
+    result = parsed_day.result
+
+    with reporting_errors(result):
+        Calendar.load(day)
+        puzzle_input = timed(result.timings, 'load', Calendar.read_input, day)
+        key = Calendar.key(day, puzzle_input, options) if cache is not None or store is not None else None
+
+        remaining_parts = []
+        for part in parts:
+            memoized = timed(result.timings, f'part{part}', store.load, day, part, key) if store else None
+            if memoized is None:
+                remaining_parts.append(part)
+                continue
+
+            result.answers[part] = str(memoized.answer)
+            result.memoized.append(part)
+
+        if not remaining_parts:
+            return parsed_day
+
+        solution = timed(result.timings, 'parse', Calendar.parse, day, puzzle_input, cache, key, options)
+
+        if len(remaining_parts) > 1 or day in Calendar.parallel:
+            try:
+                parsed_day.solution = pickle.dumps(solution, protocol=pickle.HIGHEST_PROTOCOL)
+                parsed_day.key = key
+                parsed_day.remaining_parts = remaining_parts
+                parsed_day.parallel = day in Calendar.parallel
+                return parsed_day
+            except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+                pass
+
+        solve_parts(result, solution, remaining_parts, key, store)
+
+    return parsed_day
+
+
+def run_part(day: int, part: int, solution: bytes, key: Optional[str],
+             store: Optional[AnswerStore] = None) -> DayResult:
+    result = DayResult(day)
+
+    with reporting_errors(result):
+        Calendar.load(day)
+        solve_parts(result, pickle.loads(solution), [part], key, store)
+
+    return result
+
+
+def parse_job(day: int, parts: Sequence[int], cache: Optional[ParseCache], store: Optional[AnswerStore],
+              history: RuntimeHistory, options: Optional[Mapping[str, Any]] = None) -> Job:
+    expected = history.expected(day, 'load') + history.expected(day, 'parse')
+    critical_path = expected + max((history.expected(day, f'part{part}') for part in parts), default=0.0)
+    return Job(parse_day, (day, parts, cache, store, options), expected, priority=critical_path)
+
+
+def part_job(parsed_day: ParsedDay, part: int, store: Optional[AnswerStore], history: RuntimeHistory) -> Job:
+    day = parsed_day.result.day
+    return Job(
+        run_part, (day, part, parsed_day.solution, parsed_day.key, store),
+        history.expected(day, f'part{part}'), parallel=parsed_day.parallel
+    )
+
+
+def record_runtimes(history: RuntimeHistory, results: Sequence[DayResult]):
+    for result in results:
+        if result.error is not None:
+            continue
+
+        for phase, elapsed in result.timings.items():
+            # Timings of memoized parts are lookups, not what computing them takes
+            if phase not in (f'part{part}' for part in result.memoized):
+                history.update(result.day, phase, elapsed)
+
+    history.save()
+
+
+def run(days: Sequence[int], parts: Sequence[int], workers: Optional[int] = None,
+        cache: Optional[ParseCache] = None, store: Optional[AnswerStore] = None,
+        history: Optional[RuntimeHistory] = None, options: Optional[Mapping[str, Any]] = None) -> list[DayResult]:
+    """Parse every day once, then run its parts concurrently on copies of the same parsed state
+
+    Jobs are scheduled longest first by the runtimes recorded in the history of earlier runs, which
+    is updated with the runtimes of this one. Without a history every job is expected to take as long.
+    Options, like the solver of day 16, go to the days whose parse stage takes them.
+    """
+    workers = workers or os.cpu_count() or 1
+    runtimes = history if history is not None else RuntimeHistory(path=None)
+    results: dict[int, DayResult] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scheduler = Scheduler(pool, workers)
+        for day in days:
+            scheduler.add(parse_job(day, parts, cache, store, runtimes, options))
+
+        for job, future in scheduler.completed():
+            if job.func is parse_day:
+                parsed_day = future.result()
+                results[parsed_day.result.day] = parsed_day.result
+
+                for part in parsed_day.remaining_parts:
+                    scheduler.add(part_job(parsed_day, part, store, runtimes))
+
+                continue
+
+            part_result = future.result()
+            result = results[part_result.day]
+            result.timings.update(part_result.timings)
+            result.answers.update(part_result.answers)
+            result.error = result.error or part_result.error
+
+    if history is not None:
+        record_runtimes(history, list(results.values()))
+
+    return sorted(results.values(), key=lambda result: result.day)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+
+    return f"{seconds:.2f} s"
+
+
+def format_timing(result: DayResult, phase: str) -> str:
+    memoized = phase in (f'part{part}' for part in result.memoized)
+    return format_duration(result.timings.get(phase, None)) + ('*' if memoized else '')
+
+
+def format_table(results: Sequence[DayResult]) -> str:
+    header = ['day', *PHASES, 'answers']
+    rows = [
+        [
+            str(result.day),
+            *(format_timing(result, phase) for phase in PHASES),
+            result.error or ' | '.join(
+                answer if '\n' not in answer else f"<part {part} below>"
+                for part, answer in sorted(result.answers.items())
+            )
+        ]
+        for result in results
+    ]
+
+    widths = [max(map(len, column)) for column in zip(header, *rows)]
+    lines = [
+        '  '.join(cell.rjust(width) if ind < len(header) - 1 else cell for ind, (cell, width) in enumerate(zip(row, widths)))
+        for row in [header, *rows]
+    ]
+
+    multiline_answers = [
+        f"\nday {result.day} part {part}:\n{answer}"
+        for result in results
+        for part, answer in sorted(result.answers.items())
+        if '\n' in answer
+    ]
+
+    if any(result.memoized for result in results):
+        lines.append("* answer from the answer store, timing is the lookup")
+
+    return '\n'.join([*lines, *multiline_answers])
+
+
+def format_json(results: Sequence[DayResult]) -> str:
+    return json.dumps({'days': list(map(asdict, results))}, indent=2)
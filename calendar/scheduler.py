@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import json
+import os
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from calendar.cache import CACHE_DIRECTORY, write_atomically
+
+DEFAULT_RUNTIME = 1.0
+
+_worker_budget: Optional[int] = None
+
+
+def worker_budget() -> int:
+    """Number of processes the current job may use for a pool of its own
+
+    Jobs run by the scheduler get the budget it assigned them, anything else may use every CPU.
+    """
+    return _worker_budget or os.cpu_count() or 1
+
+
+def set_worker_budget(budget: Optional[int]):
+    global _worker_budget
+    _worker_budget = budget
+
+
+def run_with_budget(budget: int, func: Callable[..., Any], *args: Any) -> Any:
+    set_worker_budget(budget)
+    try:
+        return func(*args)
+    finally:
+        set_worker_budget(None)
+
+
+@dataclass
+class RuntimeHistory:
+    """Last measured runtime of each phase of each day, used to estimate how long a job will take
+
+    Without a path the history is kept in memory only.
+    """
+    path: Optional[Path] = field(default=CACHE_DIRECTORY / 'runtimes.json')
+    runtimes: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.path is None:
+            return
+
+        try:
+            self.runtimes.update(json.loads(self.path.read_text(encoding='utf-8')))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def expected(self, day: int, phase: str) -> float:
+        return self.runtimes.get(f"day{day}-{phase}", DEFAULT_RUNTIME)
+
+    def update(self, day: int, phase: str, elapsed: float):
+        self.runtimes[f"day{day}-{phase}"] = elapsed
+
+    def save(self):
+        if self.path is None:
+            return
+
+        write_atomically(self.path, json.dumps(self.runtimes, indent=2, sort_keys=True).encode('utf-8'))
+
+
+@dataclass
+class Job:
+    """A call to run on the pool
+
+    The priority is the expected runtime of the job and of everything that can only start after it,
+    parallel jobs open a pool of their own and are given a share of the workers to fill it with.
+    """
+    func: Callable[..., Any]
+    args: tuple[Any, ...]
+    expected: float
+    priority: Optional[float] = None
+    parallel: bool = False
+    budget: int = 1
+
+    def __post_init__(self):
+        if self.priority is None:
+            self.priority = self.expected
+
+
+class Scheduler:
+    """List scheduling on a shared process pool: the ready job with the longest critical path runs first
+
+    At most workers processes are busy at once, counting the processes of pools that parallel jobs
+    open themselves. A parallel job gets the share of the workers its expected runtime makes up of
+    the work that's ready, but never more than are free.
+    """
+
+    def __init__(self, pool: Executor, workers: int):
+        self.pool = pool
+        self.workers = workers
+        self.free = workers
+        self.ready: list[tuple[float, int, Job]] = []
+        self.running: dict[Future, Job] = {}
+        self.sequence = itertools.count()
+
+    def add(self, job: Job):
+        heapq.heappush(self.ready, (-job.priority, next(self.sequence), job))
+
+    def dispatch(self):
+        while self.ready and self.free:
+            _, _, job = heapq.heappop(self.ready)
+
+            if job.parallel:
+                ready_work = job.expected + sum(other.expected for _, _, other in self.ready)
+                share = round(self.workers * job.expected / ready_work) if ready_work else self.workers
+                job.budget = max(1, min(self.free, share))
+
+            self.free -= job.budget
+            self.running[self.pool.submit(run_with_budget, job.budget, job.func, *job.args)] = job
+
+    def completed(self) -> Iterator[tuple[Job, Future]]:
+        """Run jobs until none are left, yielding each as it finishes so that jobs depending on it can be added"""
+        while self.ready or self.running:
+            self.dispatch()
+            done, _ = wait(self.running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                job = self.running.pop(future)
+                self.free += job.budget
+                yield job, future
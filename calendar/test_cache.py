@@ -0,0 +1,140 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+from calendar.cache import AnswerStats, AnswerStore, ParseCache, digest, local_modules
+from calendar.puzzle_input import PuzzleInput
+
+PACKAGE = 'cache_test_package'
+
+SOURCES = {
+    '__init__.py': "",
+    'day.py': "import json\nfrom cache_test_package import helper\n\n\ndef solve():\n    return helper.double(2)\n",
+    'helper.py': "from .deep import ONE\n\n\ndef double(value):\n    return 2 * value * ONE\n",
+    'deep.py': "ONE = 1\n",
+    'unused.py': "TWO = 2\n",
+}
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise TypeError("Can't be pickled")
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """A package of a day module, the modules it imports directly or not and one it doesn't import"""
+    directory = tmp_path / PACKAGE
+    directory.mkdir()
+    for name, source in SOURCES.items():
+        (directory / name).write_text(source, encoding='utf-8')
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    importlib.import_module(f'{PACKAGE}.day')
+    yield directory
+
+    for name in [name for name in sys.modules if name.partition('.')[0] == PACKAGE]:
+        del sys.modules[name]
+
+
+def test_local_modules_follow_imports_within_the_repository(package):
+    assert local_modules(f'{PACKAGE}.day') == sorted(
+        (package / name).resolve() for name in ('__init__.py', 'day.py', 'helper.py', 'deep.py')
+    )
+
+
+def test_digest_changes_with_the_source_of_dependencies(package):
+    before = digest("input", f'{PACKAGE}.day')
+    assert digest("input", f'{PACKAGE}.day') == before
+
+    (package / 'unused.py').write_text("TWO = 3\n", encoding='utf-8')
+    assert digest("input", f'{PACKAGE}.day') == before
+
+    (package / 'deep.py').write_text("ONE = 1.0\n", encoding='utf-8')
+    assert digest("input", f'{PACKAGE}.day') != before
+
+
+def test_digest_of_input_and_options(package, tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text("1\n2\n3\n", encoding='utf-8')
+
+    # The text and a handle on the same file are the same input
+    assert digest(PuzzleInput(str(path)), f'{PACKAGE}.day') == digest("1\n2\n3\n", f'{PACKAGE}.day')
+    assert digest("1\n2\n3\n", f'{PACKAGE}.day') != digest("1\n2\n4\n", f'{PACKAGE}.day')
+
+    assert digest("input", f'{PACKAGE}.day', {}) == digest("input", f'{PACKAGE}.day')
+    assert digest("input", f'{PACKAGE}.day', {'solver': 'search'}) != digest("input", f'{PACKAGE}.day')
+
+
+def test_answer_store(tmp_path):
+    store = AnswerStore(tmp_path)
+
+    assert store.load(1, 1, 'key') is None
+    assert store.store(1, 1, 'key', 42, 0.5)
+    assert store.load(1, 1, 'key').answer == 42
+    assert store.load(1, 1, 'other') is None
+    assert store.stats(1, 1) == AnswerStats(hits=1, misses=2, saved=0.5)
+
+    assert not store.store(1, 2, 'key', Unpicklable(), 0.5)
+    assert store.load(1, 2, 'key') is None
+
+
+def test_answer_store_misses_on_entries_it_cant_load(tmp_path):
+    store = AnswerStore(tmp_path)
+    store.store(2, 1, 'key', 42, 0.5)
+    store.path(2, 1, 'key').write_bytes(b'not a pickle')
+
+    assert store.load(2, 1, 'key') is None
+    assert not store.path(2, 1, 'key').exists()
+    assert store.stats(2, 1).misses == 1
+
+    store.store(2, 1, 'key', 42, 0.5)
+    store.store(3, 1, 'key', 42, 0.5)
+    # The answer and the stats of day 2
+    assert store.invalidate([2]) == 2
+    assert store.load(3, 1, 'key').answer == 42
+
+
+def test_parse_cache(tmp_path):
+    cache = ParseCache(tmp_path)
+
+    assert cache.load(1, 'key') is None
+    assert cache.store(1, 'key', {'parsed': [1, 2, 3]})
+    assert cache.load(1, 'key') == {'parsed': [1, 2, 3]}
+    assert cache.load(1, 'other') is None
+
+    assert not cache.store(2, 'key', Unpicklable())
+    assert cache.entries() == [cache.path(1, 'key')]
+
+
+def test_parse_cache_misses_on_entries_it_cant_load(package, tmp_path):
+    cache = ParseCache(tmp_path / 'parsed')
+    (package / 'model.py').write_text("class Model:\n    pass\n", encoding='utf-8')
+    model = importlib.import_module(f'{PACKAGE}.model')
+    cache.store(1, 'key', model.Model())
+
+    # The class was renamed since the entry was stored
+    del model.Model
+    assert cache.load(1, 'key') is None
+    assert not cache.path(1, 'key').exists()
+
+    cache.path(1, 'key').write_bytes(b'not a pickle')
+    assert cache.load(1, 'key') is None
+    assert not cache.path(1, 'key').exists()
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(tmp_path, max_size=2 ** 20)
+    cache.store(1, 'key', bytes(400_000))
+    cache.store(2, 'key', bytes(400_000))
+    # Day 2 was last used long ago, loading day 1 marks it as just used
+    os.utime(cache.path(2, 'key'), (0, 0))
+    cache.load(1, 'key')
+    cache.store(3, 'key', bytes(400_000))
+
+    assert sorted(path.name for path in cache.entries()) == [cache.path(1, 'key').name, cache.path(3, 'key').name]
+    assert cache.invalidate([1, 2]) == 1
+    assert cache.entries() == [cache.path(3, 'key')]
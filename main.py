@@ -1,12 +1,155 @@
+import argparse
+import sys
+from pathlib import Path
+
+from calendar import benchmark, generators
+from calendar.cache import ParseCache, AnswerStore
+from calendar.profiling import profile_day, PROFILE_DIRECTORY
 from calendar.calendar import Calendar
+from calendar.scheduler import RuntimeHistory
+from calendar.runner import run, parse_selection, format_table, format_json, format_duration
+
+
+def solver_options(args: argparse.Namespace) -> dict[str, str]:
+    """Options for the days to be created with, only the days whose parse stage takes a solver get it"""
+    return {'solver': args.solver} if args.solver else {}
+
+
+def run_command(args: argparse.Namespace):
+    days = parse_selection(args.days) if args.days else Calendar.days()
+    cache = ParseCache() if args.parse_cache and not args.no_cache else None
+    store = AnswerStore() if not args.no_cache else None
+    results = run(days, parse_selection(args.parts), workers=args.workers, cache=cache, store=store,
+                  history=RuntimeHistory(), options=solver_options(args))
+
+    match args.output:
+        case 'json':
+            print(format_json(results))
+        case _:
+            print(format_table(results))
+
+
+def bench_command(args: argparse.Namespace):
+    days = parse_selection(args.days) if args.days else Calendar.days()
+    scales = [int(scale) for scale in args.scales.split(',')] if args.scales else [None]
+    benchmarks = benchmark.benchmark(
+        days, parse_selection(args.parts),
+        warmup=args.warmup, repeats=args.repeats, workers=args.workers, scales=scales, seed=args.seed,
+        options=solver_options(args)
+    )
+    print(benchmark.format_benchmarks(benchmarks))
+
+    current = benchmark.create_baseline(benchmarks, warmup=args.warmup, repeats=args.repeats)
+    if args.save:
+        benchmark.save_baseline(args.save, current)
+
+    if args.compare:
+        regressions = benchmark.compare(
+            benchmark.load_baseline(args.compare), current,
+            threshold=args.threshold, min_duration=args.min_duration
+        )
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%} against {args.compare}:")
+            print(benchmark.format_regressions(regressions))
+            sys.exit(1)
+
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+def cache_command(args: argparse.Namespace):
+    cache = ParseCache()
+    store = AnswerStore()
+    days = parse_selection(args.days) if args.days else None
+
+    match args.action:
+        case 'clear':
+            removed = cache.invalidate(days)
+            print(f"Removed {removed} cached parse(s) from {cache.directory}")
+            removed = store.invalidate(days)
+            print(f"Removed {removed} memoized answer file(s) from {store.directory}")
+        case _:
+            entries = cache.entries(days)
+            size = sum(entry.stat().st_size for entry in entries)
+            print(f"{len(entries)} cached parse(s), {size / 2 ** 20:.1f} MiB in {cache.directory}")
+
+            for day in days or Calendar.days():
+                for part in (1, 2):
+                    stats = store.stats(day, part)
+                    if stats.hits or stats.misses:
+                        print(f"day {day:>2} part {part}: {stats.hits} hit(s), {stats.misses} miss(es), "
+                              f"{format_duration(stats.saved)} saved")
+
+
+def profile_command(args: argparse.Namespace):
+    profiles = profile_day(args.day, parse_selection(args.parts), top=args.top, directory=args.output_dir,
+                           options=solver_options(args))
+    print('\n\n'.join(map(str, profiles)))
+
+
+def generate_command(args: argparse.Namespace):
+    if args.output:
+        generators.write_input(args.day, args.scale, args.seed, path=args.output)
+        return
+
+    for line in generators.generate(args.day, args.scale, args.seed):
+        print(line)
 
 
 def main():
-    solution = Calendar.get(day=21)
+    parser = argparse.ArgumentParser(description="Advent of Code 2022 solutions")
+    commands = parser.add_subparsers(required=True)
+
+    run_parser = commands.add_parser('run', help="Run a selection of days and time each phase")
+    run_parser.add_argument('--days', help="Days to run, e.g. '1-21' or '1,5,12-15' (default: all)")
+    run_parser.add_argument('--parts', default='1,2', help="Parts to run (default: '1,2')")
+    run_parser.add_argument('--workers', type=int,
+                            help="Processes to use in total, including pools of parallel days (default: number of CPUs)")
+    run_parser.add_argument('--output', choices=['table', 'json'], default='table')
+    run_parser.add_argument('--parse-cache', action='store_true', help="Reuse parsed puzzle state from the on-disk cache")
+    run_parser.add_argument('--no-cache', action='store_true', help="Bypass memoized answers and the parse cache")
+    run_parser.add_argument('--solver', help="Engine of the days that have more than one, e.g. 'search' for day 16 (default: each day's own)")
+    run_parser.set_defaults(command=run_command)
+
+    bench_parser = commands.add_parser('bench', help="Benchmark days with repeats and compare against a baseline")
+    bench_parser.add_argument('--days', help="Days to benchmark (default: all)")
+    bench_parser.add_argument('--parts', default='1,2', help="Parts to benchmark (default: '1,2')")
+    bench_parser.add_argument('--warmup', type=int, default=1, help="Untimed runs before measuring (default: 1)")
+    bench_parser.add_argument('--repeats', type=int, default=5, help="Timed runs per day (default: 5)")
+    bench_parser.add_argument('--workers', type=int, default=1, help="Days benchmarked concurrently (default: 1)")
+    bench_parser.add_argument('--save', metavar='PATH', help="Write the results as a JSON baseline")
+    bench_parser.add_argument('--compare', metavar='PATH', help="Fail if a phase regressed against this baseline")
+    bench_parser.add_argument('--threshold', type=float, default=0.1, help="Allowed slowdown of the median (default: 0.1)")
+    bench_parser.add_argument('--scales', help="Benchmark generated inputs of these sizes instead, e.g. '1000,10000'")
+    bench_parser.add_argument('--seed', type=int, default=0, help="Seed of the generated inputs (default: 0)")
+    bench_parser.add_argument('--min-duration', type=float, default=0.001,
+                              help="Ignore phases faster than this many seconds when comparing (default: 0.001)")
+    bench_parser.add_argument('--solver', help="Engine of the days that have more than one, e.g. 'search' for day 16 (default: each day's own)")
+    bench_parser.set_defaults(command=bench_command)
+
+    cache_parser = commands.add_parser('cache', help="Inspect or invalidate the parse cache and memoized answers")
+    cache_parser.add_argument('action', choices=['info', 'clear'])
+    cache_parser.add_argument('--days', help="Restrict to these days (default: all)")
+    cache_parser.set_defaults(command=cache_command)
+
+    profile_parser = commands.add_parser('profile', help="Profile parse and parts of a day with cProfile and tracemalloc")
+    profile_parser.add_argument('--day', type=int, required=True)
+    profile_parser.add_argument('--parts', default='1,2', help="Parts to profile (default: '1,2')")
+    profile_parser.add_argument('--top', type=int, default=20, help="Functions listed by cumulative time (default: 20)")
+    profile_parser.add_argument('--output-dir', type=Path, default=PROFILE_DIRECTORY,
+                                help=f"Where to write the .prof files (default: {PROFILE_DIRECTORY})")
+    profile_parser.add_argument('--solver', help="Engine of the days that have more than one, e.g. 'search' for day 16 (default: each day's own)")
+    profile_parser.set_defaults(command=profile_command)
+
+    generate_parser = commands.add_parser('generate', help="Generate a valid input of a given size for a day")
+    generate_parser.add_argument('--day', type=int, required=True)
+    generate_parser.add_argument('--scale', type=int, required=True, help="Number of lines, moves, cells, ... to generate")
+    generate_parser.add_argument('--seed', type=int, default=0)
+    generate_parser.add_argument('--output', type=Path, help="Write to this file instead of stdout")
+    generate_parser.set_defaults(command=generate_command)
 
-    print(solution.part1())
-    print(solution.part2())
+    args = parser.parse_args()
+    args.command(args)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
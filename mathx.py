@@ -1,35 +1,72 @@
+import itertools
 import math
-from dataclasses import dataclass, astuple
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import NamedTuple, Iterable, Iterator, Union, Callable, Any, Optional
 
+try:
+    import numpy
+except ModuleNotFoundError:
+    numpy = None
 
-@dataclass(frozen=True)
-class Vector:
+
+_new_vector = tuple.__new__
+
+
+class Vector(NamedTuple):
+    """A point or a direction in the plane
+
+    A tuple underneath, so hashing, comparing and unpacking run in C. The arithmetic builds results with
+    tuple.__new__ directly, skipping the generated constructor.
+    """
     x: float
     y: float
 
     def __add__(self, other):
-        return Vector(self.x + other.x, self.y + other.y)
+        return _new_vector(Vector, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other):
-        return Vector(self.x - other.x, self.y - other.y)
+        return _new_vector(Vector, (self[0] - other[0], self[1] - other[1]))
 
     def __mul__(self, scalar):
-        return Vector(scalar * self.x, scalar * self.y)
+        return _new_vector(Vector, (scalar * self[0], scalar * self[1]))
 
     def __rmul__(self, scalar):
         return self.__mul__(scalar)
 
-    def __iter__(self):
-        return iter(astuple(self))
-
     def __truediv__(self, scalar):
-        return Vector(self.x / scalar, self.y / scalar)
+        return _new_vector(Vector, (self[0] / scalar, self[1] / scalar))
 
     def __floordiv__(self, scalar):
-        return Vector(self.x // scalar, self.y // scalar)
+        return _new_vector(Vector, (self[0] // scalar, self[1] // scalar))
 
     def length(self):
-        return math.sqrt(self.x ** 2 + self.y ** 2)
+        return math.sqrt(self[0] ** 2 + self[1] ** 2)
+
+
+class IntVector(Vector):
+    """A Vector of integers, such as grid coordinates, that stays one through +, -, * and // with integers"""
+    __slots__ = ()
+
+    x: int
+    y: int
+
+    def __add__(self, other):
+        return _new_vector(IntVector, (self[0] + other[0], self[1] + other[1]))
+
+    def __sub__(self, other):
+        return _new_vector(IntVector, (self[0] - other[0], self[1] - other[1]))
+
+    def __mul__(self, scalar):
+        return _new_vector(IntVector, (scalar * self[0], scalar * self[1]))
+
+    def __floordiv__(self, scalar):
+        return _new_vector(IntVector, (self[0] // scalar, self[1] // scalar))
+
+    def manhattan_length(self) -> int:
+        return abs(self[0]) + abs(self[1])
 
 
 @dataclass(frozen=True)
@@ -40,3 +77,460 @@ class BoundingBox:
     def contains(self, point: Vector):
         return self.position.x <= point.x <= self.position.x + self.size.x \
                and self.position.y <= point.y <= self.position.y + self.size.y
+
+
+# A column of coordinates: a NumPy array if NumPy is installed, else an array of 'q' or 'd'
+Column = Any
+
+
+def _column(values: Iterable[float], integral: bool) -> Column:
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=numpy.int64 if integral else numpy.float64)
+
+    return array('q' if integral else 'd', values)
+
+
+def _is_integral(column: Column) -> bool:
+    if numpy is not None:
+        return column.dtype.kind in 'iu'
+
+    return column.typecode == 'q'
+
+
+def _item(column: Column, ind: int) -> float:
+    return column[ind].item() if numpy is not None else column[ind]
+
+
+def _extent(column: Column) -> tuple[float, float]:
+    if numpy is not None:
+        return column.min().item(), column.max().item()
+
+    return min(column), max(column)
+
+
+class VectorArray:
+    """Many vectors in two columns of coordinates, so arithmetic on all of them is one call
+
+    Backed by NumPy when it's installed and by the array module otherwise. Integer coordinates stay
+    integers, anything else is kept as floats. Iterating gives IntVectors or Vectors accordingly.
+    """
+    __slots__ = ('xs', 'ys')
+
+    def __init__(self, xs: Column, ys: Column):
+        if len(xs) != len(ys):
+            raise ValueError(f"Columns of different lengths: {len(xs)} and {len(ys)}")
+
+        self.xs = xs
+        self.ys = ys
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector]) -> 'VectorArray':
+        vectors = list(vectors)
+        integral = all(isinstance(x, int) and isinstance(y, int) for x, y in vectors)
+        return cls(_column((x for x, _ in vectors), integral), _column((y for _, y in vectors), integral))
+
+    def to_vectors(self) -> list[Vector]:
+        return list(self)
+
+    @property
+    def integral(self) -> bool:
+        return _is_integral(self.xs) and _is_integral(self.ys)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self) -> Iterator[Vector]:
+        vector = IntVector if self.integral else Vector
+        return (_new_vector(vector, (x, y)) for x, y in zip(self.xs.tolist(), self.ys.tolist()))
+
+    def __getitem__(self, ind: int) -> Vector:
+        return _new_vector(IntVector if self.integral else Vector, (_item(self.xs, ind), _item(self.ys, ind)))
+
+    def _combine(self, op: Callable[[Any, Any], Any], other: Union['VectorArray', Vector, float]) -> 'VectorArray':
+        # Pairwise with another array, with the same vector for every vector, or with a scalar for both columns
+        if isinstance(other, VectorArray):
+            other_xs, other_ys = other.xs, other.ys
+            integral = other.integral
+        elif isinstance(other, tuple):
+            other_xs, other_ys = other
+            integral = isinstance(other_xs, int) and isinstance(other_ys, int)
+        else:
+            other_xs = other_ys = other
+            integral = isinstance(other, int)
+
+        if numpy is not None:
+            return VectorArray(op(self.xs, other_xs), op(self.ys, other_ys))
+
+        if not isinstance(other, VectorArray):
+            other_xs, other_ys = itertools.repeat(other_xs), itertools.repeat(other_ys)
+
+        integral = integral and self.integral and op is not operator.truediv
+        return VectorArray(_column(map(op, self.xs, other_xs), integral), _column(map(op, self.ys, other_ys), integral))
+
+    def __add__(self, other: Union['VectorArray', Vector]) -> 'VectorArray':
+        return self._combine(operator.add, other)
+
+    def __sub__(self, other: Union['VectorArray', Vector]) -> 'VectorArray':
+        return self._combine(operator.sub, other)
+
+    def __mul__(self, scalar: float) -> 'VectorArray':
+        return self._combine(operator.mul, scalar)
+
+    def __rmul__(self, scalar: float) -> 'VectorArray':
+        return self.__mul__(scalar)
+
+    def __truediv__(self, scalar: float) -> 'VectorArray':
+        return self._combine(operator.truediv, scalar)
+
+    def __floordiv__(self, scalar: float) -> 'VectorArray':
+        return self._combine(operator.floordiv, scalar)
+
+    def accumulate(self) -> 'VectorArray':
+        """Running sums, the vector at every index added to all the ones before it"""
+        if numpy is not None:
+            return VectorArray(numpy.cumsum(self.xs), numpy.cumsum(self.ys))
+
+        integral = self.integral
+        return VectorArray(
+            _column(itertools.accumulate(self.xs), integral), _column(itertools.accumulate(self.ys), integral)
+        )
+
+    def manhattan_lengths(self) -> Column:
+        if numpy is not None:
+            return numpy.abs(self.xs) + numpy.abs(self.ys)
+
+        return _column((abs(x) + abs(y) for x, y in zip(self.xs, self.ys)), self.integral)
+
+    def lengths(self) -> Column:
+        if numpy is not None:
+            return numpy.hypot(self.xs, self.ys)
+
+        return _column(map(math.hypot, self.xs, self.ys), False)
+
+    def bounding_box(self) -> BoundingBox:
+        """The smallest box around every vector, which has to have one"""
+        if not len(self):
+            raise ValueError("An empty VectorArray has no bounding box")
+
+        (min_x, max_x), (min_y, max_y) = _extent(self.xs), _extent(self.ys)
+        vector = IntVector if self.integral else Vector
+        return BoundingBox(_new_vector(vector, (min_x, min_y)), _new_vector(vector, (max_x - min_x, max_y - min_y)))
+
+
+class Grid2D:
+    """A dense grid of small values, one byte a cell, rows one after another in a bytearray
+
+    Cells are addressed by (x, y) or by their flat index y * width + x. Rows and columns come as
+    memoryviews of the cells, so reading them copies nothing.
+    """
+    __slots__ = ('width', 'height', 'cells')
+
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None, fill: int = 0):
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+
+        if len(cells) != width * height:
+            raise ValueError(f"{len(cells)} cells don't make a {width}x{height} grid")
+
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def parse(cls, data: Union[str, bytes], table: Optional[bytes] = None) -> 'Grid2D':
+        """A grid of the bytes of equally long lines, translated with a bytes.maketrans table if given"""
+        if isinstance(data, str):
+            data = data.encode()
+
+        rows = data.split()
+        if any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("The rows of a grid have to be equally long")
+
+        cells = b''.join(rows)
+        if table is not None:
+            cells = cells.translate(table)
+
+        return cls(len(rows[0]) if rows else 0, len(rows), bytearray(cells))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def position(self, index: int) -> IntVector:
+        y, x = divmod(index, self.width)
+        return _new_vector(IntVector, (x, y))
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        x, y = position
+        return self.cells[y * self.width + x]
+
+    def __setitem__(self, position: tuple[int, int], value: int):
+        x, y = position
+        self.cells[y * self.width + x] = value
+
+    def row(self, y: int) -> memoryview:
+        return memoryview(self.cells)[y * self.width:(y + 1) * self.width]
+
+    def column(self, x: int) -> memoryview:
+        return memoryview(self.cells)[x::self.width]
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        """Flat indices of the cells left, right, above and below that are in the grid"""
+        y, x = divmod(index, self.width)
+
+        if x > 0:
+            yield index - 1
+        if x < self.width - 1:
+            yield index + 1
+        if y > 0:
+            yield index - self.width
+        if y < self.height - 1:
+            yield index + self.width
+
+    def neighbours8(self, index: int) -> Iterator[int]:
+        """Flat indices of the cells around, diagonals included, that are in the grid"""
+        y, x = divmod(index, self.width)
+
+        for dy in (-1, 0, 1):
+            if not 0 <= y + dy < self.height:
+                continue
+
+            for dx in (-1, 0, 1):
+                if (dx or dy) and 0 <= x + dx < self.width:
+                    yield index + dy * self.width + dx
+
+
+# The bits of a bitset, as the digits '0' and '1' of a binary number
+_BIT_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+class VoxelGrid:
+    """A dense box of voxels, one byte each, x varying fastest, then y, then z
+
+    The voxels of a value can also be taken as a bitset, a Python int with bit i set for flat index i,
+    which makes counting faces and flood filling a handful of big integer operations per step.
+    """
+    __slots__ = ('size', 'origin', 'cells')
+
+    def __init__(self, size: tuple[int, int, int], origin: tuple[int, int, int] = (0, 0, 0),
+                 cells: Optional[bytearray] = None):
+        width, height, depth = size
+        if cells is None:
+            cells = bytearray(width * height * depth)
+
+        if len(cells) != width * height * depth:
+            raise ValueError(f"{len(cells)} cells don't make a {width}x{height}x{depth} box")
+
+        self.size = size
+        self.origin = origin
+        self.cells = cells
+
+    @classmethod
+    def from_points(cls, points: Iterable[tuple[int, int, int]], value: int = 1, padding: int = 1) -> 'VoxelGrid':
+        """The box around the points with padding empty voxels on every side, the points set to value"""
+        points = list(points)
+        if not points:
+            raise ValueError("A VoxelGrid needs at least one point")
+
+        # Axis by axis, as transposing millions of points into tuples sets off the garbage collector
+        lows = [min(map(operator.itemgetter(axis), points)) - padding for axis in range(3)]
+        highs = [max(map(operator.itemgetter(axis), points)) + padding for axis in range(3)]
+        grid = cls(tuple(high - low + 1 for low, high in zip(lows, highs)), tuple(lows))
+
+        origin_x, origin_y, origin_z = grid.origin
+        width, height, _ = grid.size
+        cells = grid.cells
+
+        for x, y, z in points:
+            cells[((z - origin_z) * height + y - origin_y) * width + x - origin_x] = value
+
+        return grid
+
+    @property
+    def strides(self) -> tuple[int, int, int]:
+        width, height, _ = self.size
+        return 1, width, width * height
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def index(self, x: int, y: int, z: int) -> int:
+        origin_x, origin_y, origin_z = self.origin
+        width, height, _ = self.size
+        return ((z - origin_z) * height + y - origin_y) * width + x - origin_x
+
+    def contains(self, x: int, y: int, z: int) -> bool:
+        return all(low <= coordinate < low + length
+                   for coordinate, low, length in zip((x, y, z), self.origin, self.size))
+
+    def __getitem__(self, point: tuple[int, int, int]) -> int:
+        return self.cells[self.index(*point)]
+
+    def __setitem__(self, point: tuple[int, int, int], value: int):
+        self.cells[self.index(*point)] = value
+
+    def bits(self, value: int = 1) -> int:
+        table = bytes(1 if byte == value else 0 for byte in range(256))
+        return int(self.cells.translate(table).translate(_BIT_DIGITS)[::-1], 2)
+
+    def surface_area(self, bits: int) -> int:
+        """Faces of the voxels in the bitset that don't touch another one of them
+
+        Neighbours are found by shifting with the strides, which would pair the last voxel of a row with
+        the first of the next one. Those are on the border, which the voxels may not touch.
+        """
+        shared = sum((bits & bits >> stride).bit_count() for stride in self.strides)
+        return 6 * bits.bit_count() - 2 * shared
+
+    def flood_fill(self, start: int, passable: int) -> int:
+        """Bitset of the voxels reached from flat index start through the passable ones, breadth first
+
+        Every step grows the frontier by one voxel in every direction at once. Like surface_area, it pairs
+        the ends of rows, so the passable voxels on the border should all be reached anyway.
+        """
+        reached = frontier = 1 << start
+
+        while frontier:
+            grown = frontier
+            for stride in self.strides:
+                grown |= frontier << stride | frontier >> stride
+
+            frontier = grown & passable & ~reached
+            reached |= frontier
+
+        return reached
+
+
+class IntervalSet:
+    """Integers covered by disjoint half open intervals [start, end), in sorted parallel arrays of starts and ends
+
+    Intervals that overlap or touch are merged, so every end is the first integer after it that isn't covered.
+    Lookups and inserts find their place by bisection.
+    """
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()):
+        self.starts = array('q')
+        self.ends = array('q')
+
+        # Sorted once and merged in a single pass, rather than inserted one by one
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def add(self, start: int, end: int):
+        if end <= start:
+            return
+
+        # The intervals from first to last overlap or touch [start, end)
+        first = bisect_left(self.ends, start)
+        last = bisect_right(self.starts, end)
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+
+        self.starts[first:last] = array('q', (start,))
+        self.ends[first:last] = array('q', (end,))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __contains__(self, value: int) -> bool:
+        ind = bisect_right(self.starts, value) - 1
+        return ind >= 0 and value < self.ends[ind]
+
+    @property
+    def length(self) -> int:
+        """How many integers are covered"""
+        return sum(self.ends) - sum(self.starts)
+
+    def covers(self, start: int, end: int) -> bool:
+        ind = bisect_right(self.starts, start) - 1
+        return end <= start or (ind >= 0 and end <= self.ends[ind])
+
+    def overlaps(self, start: int, end: int) -> bool:
+        ind = bisect_right(self.ends, start)
+        return start < end and ind < len(self.starts) and self.starts[ind] < end
+
+    def issuperset(self, other: 'IntervalSet') -> bool:
+        return all(self.covers(start, end) for start, end in other)
+
+    def isdisjoint(self, other: 'IntervalSet') -> bool:
+        return not any(self.overlaps(start, end) for start, end in other)
+
+    def __or__(self, other: 'IntervalSet') -> 'IntervalSet':
+        return IntervalSet(itertools.chain(self, other))
+
+    def __and__(self, other: 'IntervalSet') -> 'IntervalSet':
+        intersection = IntervalSet()
+        ind = other_ind = 0
+
+        # Both are sorted, whichever interval ends first can't overlap anything after the other's current one
+        while ind < len(self.starts) and other_ind < len(other.starts):
+            start = max(self.starts[ind], other.starts[other_ind])
+            end = min(self.ends[ind], other.ends[other_ind])
+            if start < end:
+                intersection.starts.append(start)
+                intersection.ends.append(end)
+
+            if self.ends[ind] < other.ends[other_ind]:
+                ind += 1
+            else:
+                other_ind += 1
+
+        return intersection
+
+    def complement(self, start: int, end: int) -> 'IntervalSet':
+        """The integers of [start, end) that aren't covered"""
+        gaps = IntervalSet()
+
+        for ind in range(bisect_right(self.ends, start), len(self.starts)):
+            if self.starts[ind] >= end:
+                break
+
+            if self.starts[ind] > start:
+                gaps.starts.append(start)
+                gaps.ends.append(self.starts[ind])
+
+            start = self.ends[ind]
+
+        if start < end:
+            gaps.starts.append(start)
+            gaps.ends.append(end)
+
+        return gaps
+
+    def first_gap(self, start: int, end: int) -> Optional[int]:
+        """The first integer of [start, end) that isn't covered, if there is one"""
+        ind = bisect_right(self.starts, start) - 1
+        if ind >= 0 and start < self.ends[ind]:
+            start = self.ends[ind]
+
+        return start if start < end else None
@@ -1,15 +1,19 @@
+import heapq
+import itertools
 import math
-from abc import abstractmethod
-from asyncio import Protocol
+import multiprocessing
+import os
+import time
+from array import array
 from collections import deque
-from dataclasses import dataclass, field
-from queue import PriorityQueue, Empty
-from typing import Iterable, TypeVar, Callable, Generic
-
-from itertoolsx import iter_except
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Iterable, TypeVar, Callable, Generic, Optional, Hashable
 
 
 Node = TypeVar("Node")
+State = TypeVar("State")
 
 
 @dataclass
@@ -27,10 +31,51 @@ class Path(Generic[Node]):
     length: float
 
 
-@dataclass(order=True)
-class ScoredNode:
-    f_score: float
-    node: Node = field(compare=False)
+@dataclass
+class SearchStats:
+    """Work done by searches, filled in by any search it is passed to
+
+    Pass the same stats to several searches to total their work, the peaks are then the highest any
+    single search reached. Relaxed edges are the ones that improved the distance of the node they lead
+    to, stale pops are heap entries skipped because their node was reached more cheaply after they
+    were pushed. The g score size counts the nodes that were given a distance.
+
+    Branch and bound counts the children it keeps as relaxed, the ones it cuts off by their bound as
+    pruned and the states it skips for a dominating one as dominated, its g score is the dominance memo.
+    """
+    searches: int = 0
+    expanded: int = 0
+    relaxed: int = 0
+    stale: int = 0
+    pruned: int = 0
+    dominated: int = 0
+    peak_frontier: int = 0
+    peak_g_score: int = 0
+    elapsed: float = 0.0
+
+    def add(self, other: 'SearchStats'):
+        """Total the work of another search into these stats, with peaks of the highest"""
+        self.searches += other.searches
+        self.expanded += other.expanded
+        self.relaxed += other.relaxed
+        self.stale += other.stale
+        self.pruned += other.pruned
+        self.dominated += other.dominated
+        self.peak_frontier = max(self.peak_frontier, other.peak_frontier)
+        self.peak_g_score = max(self.peak_g_score, other.peak_g_score)
+        self.elapsed += other.elapsed
+
+    def record(self, started: float, expanded: int, relaxed: int, stale: int, peak_frontier: int, g_score_size: int,
+               pruned: int = 0, dominated: int = 0):
+        self.elapsed += time.perf_counter() - started
+        self.searches += 1
+        self.expanded += expanded
+        self.relaxed += relaxed
+        self.stale += stale
+        self.pruned += pruned
+        self.dominated += dominated
+        self.peak_frontier = max(self.peak_frontier, peak_frontier)
+        self.peak_g_score = max(self.peak_g_score, g_score_size)
 
 
 def reconstruct_path(came_from: dict[Node, Node], current: Node) -> list[Node]:
@@ -48,33 +93,704 @@ def a_star(
         goal: Node,
         neighbours: Callable[[Node], Iterable[Node]],
         heuristic: Callable[[Node], float],
-        distance: Callable[[Node, Node], float]
+        distance: Callable[[Node, Node], float],
+        stats: Optional[SearchStats] = None
 ) -> Path[Node]:
-    open_set: PriorityQueue[ScoredNode] = PriorityQueue()
-    open_set.put_nowait(ScoredNode(heuristic(start), start))
+    """A* on a binary heap
+
+    A node whose g score improves is pushed again rather than updated in place, the entries it
+    leaves behind are skipped as stale when they are popped. A counter breaks ties between equal
+    f scores in push order, so nodes never need to be comparable.
+    """
+    counter = itertools.count()
+    open_set: list[tuple[float, int, float, Node]] = [(heuristic(start), next(counter), 0, start)]
 
     came_from: dict[Node, Node] = {}
     g_score = {start: 0}
 
-    for current_scored_node in iter_except(open_set.get_nowait, Empty):
-        current_node = current_scored_node.node
-        if current_node == goal:
-            nodes = reconstruct_path(came_from, current_node)
-            return Path(nodes, g_score.get(current_node))
+    started = time.perf_counter()
+    expanded = relaxed = stale = 0
+    peak_frontier = 1
+
+    try:
+        while open_set:
+            _, _, current_g_score, current_node = heapq.heappop(open_set)
+            if current_g_score > g_score[current_node]:
+                stale += 1
+                continue
+
+            expanded += 1
+
+            if current_node == goal:
+                nodes = reconstruct_path(came_from, current_node)
+                return Path(nodes, current_g_score)
+
+            for neighbour in neighbours(current_node):
+                tentative_g_score = current_g_score + distance(current_node, neighbour)
+                if tentative_g_score >= g_score.get(neighbour, math.inf):
+                    continue
+
+                relaxed += 1
+                came_from[neighbour] = current_node
+                g_score[neighbour] = tentative_g_score
+                f_score = tentative_g_score + heuristic(neighbour)
+                heapq.heappush(open_set, (f_score, next(counter), tentative_g_score, neighbour))
+
+                if len(open_set) > peak_frontier:
+                    peak_frontier = len(open_set)
+
+        raise PathNotFoundError(start, goal)
+    finally:
+        if stats is not None:
+            stats.record(started, expanded, relaxed, stale, peak_frontier, len(g_score))
+
+
+def breadth_first_distances(
+        sources: Iterable[Node],
+        neighbours: Callable[[Node], Iterable[Node]],
+        stats: Optional[SearchStats] = None
+) -> dict[Node, int]:
+    """Number of steps from the nearest of the sources to every node reachable from them"""
+    started = time.perf_counter()
+    distances = {source: 0 for source in sources}
+    frontier = deque(distances)
+    expanded = 0
+    peak_frontier = source_count = len(frontier)
+
+    while frontier:
+        current_node = frontier.popleft()
+        neighbour_distance = distances[current_node] + 1
+        expanded += 1
+
+        for neighbour in neighbours(current_node):
+            if neighbour not in distances:
+                distances[neighbour] = neighbour_distance
+                frontier.append(neighbour)
+
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+
+    if stats is not None:
+        stats.record(started, expanded, len(distances) - source_count, 0, peak_frontier, len(distances))
+
+    return distances
+
+
+def dijkstra_distances(
+        sources: Iterable[Node],
+        neighbours: Callable[[Node], Iterable[Node]],
+        distance: Callable[[Node, Node], float],
+        stats: Optional[SearchStats] = None
+) -> dict[Node, float]:
+    """Length of the shortest path from the nearest of the sources to every node reachable from them"""
+    started = time.perf_counter()
+    counter = itertools.count()
+    distances = {source: 0 for source in sources}
+    open_set = [(0, next(counter), source) for source in distances]
+    settled: set[Node] = set()
+    relaxed = stale = 0
+    peak_frontier = len(open_set)
+
+    while open_set:
+        current_distance, _, current_node = heapq.heappop(open_set)
+        if current_node in settled:
+            stale += 1
+            continue
+
+        settled.add(current_node)
 
         for neighbour in neighbours(current_node):
-            tentative_g_score = g_score.get(current_node, math.inf) + distance(current_node, neighbour)
-            if tentative_g_score >= g_score.get(neighbour, math.inf):
+            tentative_distance = current_distance + distance(current_node, neighbour)
+            if tentative_distance >= distances.get(neighbour, math.inf):
+                continue
+
+            relaxed += 1
+            distances[neighbour] = tentative_distance
+            heapq.heappush(open_set, (tentative_distance, next(counter), neighbour))
+
+            if len(open_set) > peak_frontier:
+                peak_frontier = len(open_set)
+
+    if stats is not None:
+        stats.record(started, len(settled), relaxed, stale, peak_frontier, len(distances))
+
+    return distances
+
+
+def reverse_distances(
+        goals: Iterable[Node],
+        predecessors: Callable[[Node], Iterable[Node]],
+        distance: Optional[Callable[[Node, Node], float]] = None,
+        stats: Optional[SearchStats] = None
+) -> dict[Node, float]:
+    """Length of the shortest path from every node that can reach one of the goals to the nearest of them
+
+    Searches backwards from the goals, predecessors(node) are the nodes with an edge into node and
+    distance(predecessor, node) is the length of that edge. Without a distance every edge is one step.
+    """
+    if distance is None:
+        return breadth_first_distances(goals, predecessors, stats)
+
+    return dijkstra_distances(goals, predecessors, lambda node, predecessor: distance(predecessor, node), stats)
+
+
+@dataclass(frozen=True)
+class Graph(Generic[Node]):
+    """Adjacency in compressed sparse row form
+
+    Nodes are numbered densely by their position in nodes. The targets of the edges leaving node id
+    are targets[offsets[id]:offsets[id + 1]] with the lengths at the same positions in weights, or
+    one step each without weights. Searches take and return node ids and keep their state in flat
+    arrays indexed by them, distances are math.inf for nodes that can't be reached.
+    """
+    nodes: tuple[Node, ...]
+    offsets: array
+    targets: array
+    weights: Optional[array] = None
+
+    @classmethod
+    def from_neighbours(
+            cls,
+            nodes: Iterable[Node],
+            neighbours: Callable[[Node], Iterable[Node]],
+            distance: Optional[Callable[[Node, Node], float]] = None
+    ) -> 'Graph[Node]':
+        """Graph of the given nodes and of every node reachable from them
+
+        The given nodes are numbered first, in their order, the nodes they reach after them.
+        """
+        ids: dict[Node, int] = {}
+        order: list[Node] = []
+
+        def get_id(node: Node) -> int:
+            node_id = ids.get(node, None)
+            if node_id is None:
+                node_id = ids[node] = len(order)
+                order.append(node)
+
+            return node_id
+
+        for node in nodes:
+            get_id(node)
+
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d') if distance is not None else None
+
+        # order grows while it's walked, so every reachable node gets its edges
+        for node in order:
+            for neighbour in neighbours(node):
+                targets.append(get_id(neighbour))
+
+                if weights is not None:
+                    weights.append(distance(node, neighbour))
+
+            offsets.append(len(targets))
+
+        graph = cls(tuple(order), offsets, targets, weights)
+        graph.__dict__['ids'] = ids
+        return graph
+
+    @cached_property
+    def ids(self) -> dict[Node, int]:
+        return {node: node_id for node_id, node in enumerate(self.nodes)}
+
+    @property
+    def size(self) -> int:
+        return len(self.nodes)
+
+    def neighbours(self, node_id: int) -> array:
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def reversed(self) -> 'Graph[Node]':
+        """The same graph with every edge turned around, for searching backwards from goals"""
+        counts = [0] * (self.size + 1)
+        for target in self.targets:
+            counts[target + 1] += 1
+
+        offsets = array('i', itertools.accumulate(counts))
+        targets = array('i', [0]) * len(self.targets)
+        weights = array('d', [0]) * len(self.targets) if self.weights is not None else None
+        positions = offsets[:-1]
+
+        for source in range(self.size):
+            for edge in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[edge]
+                targets[positions[target]] = source
+
+                if weights is not None:
+                    weights[positions[target]] = self.weights[edge]
+
+                positions[target] += 1
+
+        graph = Graph(self.nodes, offsets, targets, weights)
+        graph.__dict__['ids'] = self.ids
+        return graph
+
+    def breadth_first_distances(self, source_ids: Iterable[int], stats: Optional[SearchStats] = None) -> array:
+        """Number of steps from the nearest of the sources to every node, ignoring weights"""
+        started = time.perf_counter()
+        offsets, targets = self.offsets, self.targets
+        distances = array('d', [math.inf]) * self.size
+        frontier = deque(source_ids)
+        expanded = relaxed = 0
+        peak_frontier = len(frontier)
+
+        for source_id in frontier:
+            distances[source_id] = 0
+
+        while frontier:
+            current_id = frontier.popleft()
+            neighbour_distance = distances[current_id] + 1
+            expanded += 1
+
+            for neighbour_id in targets[offsets[current_id]:offsets[current_id + 1]]:
+                if distances[neighbour_id] == math.inf:
+                    relaxed += 1
+                    distances[neighbour_id] = neighbour_distance
+                    frontier.append(neighbour_id)
+
+            if len(frontier) > peak_frontier:
+                peak_frontier = len(frontier)
+
+        if stats is not None:
+            stats.record(started, expanded, relaxed, 0, peak_frontier, expanded)
+
+        return distances
+
+    def dijkstra_distances(self, source_ids: Iterable[int], stats: Optional[SearchStats] = None) -> array:
+        """Length of the shortest path from the nearest of the sources to every node"""
+        if self.weights is None:
+            return self.breadth_first_distances(source_ids, stats)
+
+        started = time.perf_counter()
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = array('d', [math.inf]) * self.size
+        open_set = []
+
+        for source_id in source_ids:
+            distances[source_id] = 0
+            open_set.append((0, source_id))
+
+        expanded = relaxed = stale = 0
+        peak_frontier = reached = len(open_set)
+
+        while open_set:
+            current_distance, current_id = heapq.heappop(open_set)
+            if current_distance > distances[current_id]:
+                stale += 1
+                continue
+
+            expanded += 1
+
+            for edge in range(offsets[current_id], offsets[current_id + 1]):
+                neighbour_id = targets[edge]
+                tentative_distance = current_distance + weights[edge]
+                if tentative_distance < distances[neighbour_id]:
+                    relaxed += 1
+                    reached += distances[neighbour_id] == math.inf
+                    distances[neighbour_id] = tentative_distance
+                    heapq.heappush(open_set, (tentative_distance, neighbour_id))
+
+                    if len(open_set) > peak_frontier:
+                        peak_frontier = len(open_set)
+
+        if stats is not None:
+            stats.record(started, expanded, relaxed, stale, peak_frontier, reached)
+
+        return distances
+
+    def a_star(self, start_id: int, goal_id: int, heuristic: Callable[[int], float],
+               stats: Optional[SearchStats] = None) -> Path[Node]:
+        """Like a_star on the nodes themselves, with the heuristic taking node ids"""
+        started = time.perf_counter()
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        g_score = array('d', [math.inf]) * self.size
+        came_from = array('i', [-1]) * self.size
+
+        g_score[start_id] = 0
+        open_set = [(heuristic(start_id), 0, start_id)]
+        expanded = relaxed = stale = 0
+        peak_frontier = reached = 1
+
+        try:
+            while open_set:
+                _, current_g_score, current_id = heapq.heappop(open_set)
+                if current_g_score > g_score[current_id]:
+                    stale += 1
+                    continue
+
+                expanded += 1
+
+                if current_id == goal_id:
+                    nodes = deque()
+                    while came_from[current_id] != -1:
+                        current_id = came_from[current_id]
+                        nodes.appendleft(self.nodes[current_id])
+
+                    return Path(list(nodes), current_g_score)
+
+                for edge in range(offsets[current_id], offsets[current_id + 1]):
+                    neighbour_id = targets[edge]
+                    tentative_g_score = current_g_score + (weights[edge] if weights is not None else 1)
+                    if tentative_g_score < g_score[neighbour_id]:
+                        relaxed += 1
+                        reached += g_score[neighbour_id] == math.inf
+                        g_score[neighbour_id] = tentative_g_score
+                        came_from[neighbour_id] = current_id
+                        f_score = tentative_g_score + heuristic(neighbour_id)
+                        heapq.heappush(open_set, (f_score, tentative_g_score, neighbour_id))
+
+                        if len(open_set) > peak_frontier:
+                            peak_frontier = len(open_set)
+
+            raise PathNotFoundError(self.nodes[start_id], self.nodes[goal_id])
+        finally:
+            if stats is not None:
+                stats.record(started, expanded, relaxed, stale, peak_frontier, reached)
+
+
+@dataclass(frozen=True)
+class DistanceTable(Generic[Node]):
+    """Shortest distances between every pair of nodes
+
+    Nodes are numbered by their position in nodes and the distances are kept as a flat row major
+    matrix of doubles, math.inf where there's no path. Tables pickle, so a table built while parsing
+    is kept by the parse cache along with the rest of the parsed state.
+    """
+    nodes: tuple[Node, ...]
+    matrix: array
+
+    @cached_property
+    def ids(self) -> dict[Node, int]:
+        return {node: node_id for node_id, node in enumerate(self.nodes)}
+
+    @property
+    def size(self) -> int:
+        return len(self.nodes)
+
+    def between(self, start_id: int, end_id: int) -> float:
+        return self.matrix[start_id * self.size + end_id]
+
+    def __getitem__(self, pair: tuple[Node, Node]) -> float:
+        start, end = pair
+        return self.between(self.ids[start], self.ids[end])
+
+
+distance_table_memo_size = 64
+_distance_tables: dict[Hashable, DistanceTable] = {}
+
+
+def all_pairs_distances(
+        nodes: Iterable[Node],
+        neighbours: Callable[[Node], Iterable[Node]],
+        distance: Optional[Callable[[Node, Node], float]] = None,
+        stats: Optional[SearchStats] = None
+) -> DistanceTable[Node]:
+    """Distances between every pair of nodes in one go, paths may pass through nodes not among them
+
+    Without a distance every edge is one step and a breadth first search is run from each node,
+    weighted graphs are solved with Floyd-Warshall, which suits dense ones best. Stats count every
+    breadth first search separately, Floyd-Warshall as one search that expands every node.
+
+    Tables are memoized by the nodes and the edges of the graph they span, the memo forgets its
+    oldest tables beyond distance_table_memo_size of them. A memoized table adds nothing to stats.
+    """
+    nodes = tuple(nodes)
+    graph = Graph.from_neighbours(nodes, neighbours, distance)
+    key = (
+        len(nodes), graph.nodes, graph.offsets.tobytes(), graph.targets.tobytes(),
+        graph.weights.tobytes() if graph.weights is not None else None
+    )
+
+    table = _distance_tables.get(key, None)
+    if table is None:
+        table = _distance_tables[key] = _all_pairs_distances(nodes, graph, stats)
+        if len(_distance_tables) > distance_table_memo_size:
+            del _distance_tables[next(iter(_distance_tables))]
+
+    return table
+
+
+def _all_pairs_distances(
+        nodes: tuple[Node, ...],
+        graph: Graph[Node],
+        stats: Optional[SearchStats]
+) -> DistanceTable[Node]:
+    size = len(nodes)
+    matrix = array('d')
+
+    if graph.weights is None:
+        for start_id in range(size):
+            matrix.extend(graph.breadth_first_distances([start_id], stats)[:size])
+
+        return DistanceTable(nodes, matrix)
+
+    started = time.perf_counter()
+    relaxed = 0
+    graph_size = graph.size
+    graph_matrix = array('d', [math.inf]) * (graph_size * graph_size)
+
+    for start_id in range(graph_size):
+        graph_matrix[start_id * graph_size + start_id] = 0
+
+        for edge in range(graph.offsets[start_id], graph.offsets[start_id + 1]):
+            edge_ind = start_id * graph_size + graph.targets[edge]
+            graph_matrix[edge_ind] = min(graph_matrix[edge_ind], graph.weights[edge])
+
+    for via_id in range(graph_size):
+        via_row = graph_matrix[via_id * graph_size:(via_id + 1) * graph_size]
+
+        for start_id in range(graph_size):
+            row_offset = start_id * graph_size
+            to_via = graph_matrix[row_offset + via_id]
+            if to_via == math.inf:
                 continue
 
-            came_from[neighbour] = current_node
-            g_score[neighbour] = tentative_g_score
-            f_score = tentative_g_score + heuristic(neighbour)
-            scored_neighbour = ScoredNode(f_score, neighbour)
+            for end_id, from_via in enumerate(via_row):
+                if to_via + from_via < graph_matrix[row_offset + end_id]:
+                    relaxed += 1
+                    graph_matrix[row_offset + end_id] = to_via + from_via
+
+    if stats is not None:
+        stats.record(started, graph_size, relaxed, 0, 0, graph_size * graph_size)
+
+    for start_id in range(size):
+        matrix.extend(graph_matrix[start_id * graph_size:start_id * graph_size + size])
+
+    return DistanceTable(nodes, matrix)
+
+
+class SharedIncumbent:
+    """Best value found by any of the processes searching side by side, kept in a multiprocessing.Value
+
+    Offers are compared and set under the value's lock, reads go to the shared double underneath and
+    skip the lock, as a stale read only means pruning a little less for a while. Searches read it every
+    sync_interval expansions.
+    """
+    sync_interval = 64
+
+    def __init__(self, value: Optional[Any] = None):
+        self.value = value if value is not None else multiprocessing.Value('d', -math.inf)
+        self.unlocked = self.value.get_obj()
+
+    def get(self) -> float:
+        return self.unlocked.value
+
+    def offer(self, value: float):
+        with self.value.get_lock():
+            if value > self.value.value:
+                self.value.value = value
+
+
+def branch_and_bound(
+        root: State,
+        expand: Callable[[State], Iterable[State]],
+        value: Callable[[State], float],
+        bound: Callable[[State], float],
+        dominance: Optional[Callable[[State], tuple[Hashable, float]]] = None,
+        order: str = 'dfs',
+        memo_size: int = 2 ** 20,
+        incumbent: float = -math.inf,
+        stats: Optional[SearchStats] = None,
+        shared: Optional['SharedIncumbent'] = None
+) -> tuple[Optional[State], float]:
+    """Maximize value over root and every state it expands into
+
+    Every state is a solution worth value(state) and bound(state) may not be lower than the value of
+    the state or of anything it expands into. States whose bound doesn't beat the best value found so
+    far are pruned along with everything below them. dominance(state) gives a key and a score: states
+    with equal keys have the same future, so a state is skipped if one with its key and at least its
+    score was expanded before. The memo of those forgets its oldest keys beyond memo_size of them.
+
+    Depth first ('dfs') finds good solutions early and keeps the frontier small, best first ('best')
+    expands the state with the highest bound next and stops once that can't beat the best value.
+    Returns the best state with its value, or None with the incumbent if nothing beats the incumbent.
 
-            if neighbour in map(lambda scored: scored.node, open_set.queue):
+    Searches running side by side can share their best value to prune with each other's, see
+    parallel_branch_and_bound.
+    """
+    if order not in ('dfs', 'best'):
+        raise ValueError(f"Unknown order {order!r}, expected 'dfs' or 'best'")
+
+    best_first = order == 'best'
+    started = time.perf_counter()
+    counter = itertools.count()
+    memo: dict[Hashable, float] = {}
+    expanded = relaxed = pruned = dominated = 0
+    peak_frontier = peak_memo = 1
+
+    # Prune against the best value known, which can be one another search found
+    best_state, best_state_value = None, incumbent
+    best_value = incumbent if shared is None else max(incumbent, shared.get())
+
+    root_value = value(root)
+    if root_value > best_value:
+        best_state, best_state_value, best_value = root, root_value, root_value
+        if shared is not None:
+            shared.offer(best_value)
+
+    # Entries are (-bound, counter, state) in both orders, a heap for best first and a stack for depth first
+    frontier = [(-bound(root), next(counter), root)]
+
+    while frontier:
+        negative_bound, _, state = heapq.heappop(frontier) if best_first else frontier.pop()
+
+        # The best value may have improved since the state was pushed
+        if -negative_bound <= best_value:
+            pruned += 1
+            if best_first:
+                pruned += len(frontier)
+                break
+
+            continue
+
+        if shared is not None and expanded % SharedIncumbent.sync_interval == 0:
+            best_value = max(best_value, shared.get())
+
+        if dominance is not None:
+            key, score = dominance(state)
+            if memo.get(key, -math.inf) >= score:
+                dominated += 1
                 continue
 
-            open_set.put_nowait(scored_neighbour)
+            memo[key] = score
+            if len(memo) > memo_size:
+                del memo[next(iter(memo))]
+
+            if len(memo) > peak_memo:
+                peak_memo = len(memo)
+
+        expanded += 1
+        children = []
+
+        for child in expand(state):
+            child_value = value(child)
+            if child_value > best_value:
+                best_state, best_state_value, best_value = child, child_value, child_value
+                if shared is not None:
+                    shared.offer(best_value)
+
+            child_bound = bound(child)
+            if child_bound <= best_value:
+                pruned += 1
+                continue
+
+            relaxed += 1
+            children.append((-child_bound, next(counter), child))
+
+        if best_first:
+            for child in children:
+                heapq.heappush(frontier, child)
+        else:
+            # Reversed so the first child expand gave is the first to be explored
+            frontier.extend(reversed(children))
+
+        if len(frontier) > peak_frontier:
+            peak_frontier = len(frontier)
+
+    if stats is not None:
+        stats.record(started, expanded, relaxed, 0, peak_frontier, peak_memo, pruned=pruned, dominated=dominated)
+
+    return best_state, best_state_value
+
+
+_shared_incumbent: Optional[SharedIncumbent] = None
+
+
+def _share_incumbent(value: Any):
+    global _shared_incumbent
+    _shared_incumbent = SharedIncumbent(value)
+
+
+def _search_subtree(
+        root: State,
+        expand: Callable[[State], Iterable[State]],
+        value: Callable[[State], float],
+        bound: Callable[[State], float],
+        dominance: Optional[Callable[[State], tuple[Hashable, float]]],
+        order: str,
+        memo_size: int
+) -> tuple[tuple[Optional[State], float], SearchStats]:
+    stats = SearchStats()
+    best = branch_and_bound(root, expand, value, bound, dominance, order, memo_size, stats=stats, shared=_shared_incumbent)
+    return best, stats
+
+
+def parallel_branch_and_bound(
+        root: State,
+        expand: Callable[[State], Iterable[State]],
+        value: Callable[[State], float],
+        bound: Callable[[State], float],
+        dominance: Optional[Callable[[State], tuple[Hashable, float]]] = None,
+        order: str = 'dfs',
+        memo_size: int = 2 ** 20,
+        workers: Optional[int] = None,
+        subtrees_per_worker: int = 4,
+        stats: Optional[SearchStats] = None
+) -> tuple[Optional[State], float]:
+    """branch_and_bound with the subtrees below the root searched by a pool of processes
+
+    The root is expanded level by level until there are subtrees_per_worker subtrees for every worker,
+    those are searched most promising first. The best value is shared between the processes so every
+    search prunes with the best value any of them found, dominance memos stay per subtree. expand,
+    value, bound and dominance are sent to the workers and have to pickle, so they can't be closures.
+    One worker searches in this process without a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return branch_and_bound(root, expand, value, bound, dominance, order, memo_size, stats=stats)
+
+    started = time.perf_counter()
+    best_state, best_value = root, value(root)
+    subtrees = [root]
+    expanded = 0
+
+    while 0 < len(subtrees) < workers * subtrees_per_worker:
+        next_subtrees = []
+        expanded += len(subtrees)
+
+        for state in subtrees:
+            for child in expand(state):
+                child_value = value(child)
+                if child_value > best_value:
+                    best_state, best_value = child, child_value
+
+                next_subtrees.append(child)
+
+        if not next_subtrees:
+            # Everything was expanded right here, there is nothing left for the pool to search
+            if stats is not None:
+                stats.record(started, expanded, len(subtrees), 0, len(subtrees), 0)
+
+            return best_state, best_value
+
+        subtrees = next_subtrees
+
+    bounded_subtrees = sorted(
+        ((bound(state), state) for state in subtrees),
+        key=lambda bounded_subtree: bounded_subtree[0], reverse=True
+    )
+
+    if stats is not None:
+        stats.record(started, expanded, len(subtrees), 0, len(subtrees), 0)
+
+    shared = SharedIncumbent()
+    shared.offer(best_value)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_share_incumbent, initargs=(shared.value,)) as pool:
+        futures = [
+            pool.submit(_search_subtree, state, expand, value, bound, dominance, order, memo_size)
+            for state_bound, state in bounded_subtrees
+            if state_bound > best_value
+        ]
+
+        for future in as_completed(futures):
+            (subtree_best_state, subtree_best_value), subtree_stats = future.result()
+            if subtree_best_state is not None and subtree_best_value > best_value:
+                best_state, best_value = subtree_best_state, subtree_best_value
+
+            if stats is not None:
+                stats.add(subtree_stats)
 
-    raise PathNotFoundError(start, goal)
\ No newline at end of file
+    return best_state, best_value
@@ -2,22 +2,23 @@ from dataclasses import dataclass
 from itertools import islice
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import isplit
 
 
-@Calendar.register(day=1)
-@dataclass
+@Calendar.register(day=1, streaming=True)
+@dataclass(frozen=True)
 class Solution:
-    puzzle_input: str
+    total_calories: tuple[int, ...]
 
-    def __post_init__(self):
-        lines = self.puzzle_input.splitlines()
-        elf_inventories = isplit(lines, '')
+    @classmethod
+    def parse(cls, puzzle_input: PuzzleInput) -> 'Solution':
+        elf_inventories = isplit(puzzle_input.lines(), '')
 
-        self.total_calories = [
+        return cls(tuple(
             sum(int(calorie) for calorie in inventory)
             for inventory in elf_inventories
-        ]
+        ))
 
     def part1(self):
         return max(self.total_calories)
@@ -4,13 +4,14 @@ from itertools import accumulate, starmap
 from typing import Iterable
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import flatten, batched
 
 
-@Calendar.register(day=10)
+@Calendar.register(day=10, streaming=True)
 @dataclass
 class Solution:
-    puzzle_input: str
+    puzzle_input: PuzzleInput
 
     def __post_init__(self):
         def parse_instruction(instruction: str) -> Iterable[int]:
@@ -20,7 +21,7 @@ class Solution:
                 case ['addx', n]:
                     return [0, int(n)]
 
-        self.register_values = list(accumulate(flatten(map(parse_instruction, self.puzzle_input.strip().splitlines())), initial=1))
+        self.register_values = list(accumulate(flatten(map(parse_instruction, filter(None, map(str.strip, self.puzzle_input.lines())))), initial=1))
 
     def part1(self):
         return sum(i * self.register_values[i-1] for i in range(20, 221, 40))
@@ -1,14 +1,8 @@
 from dataclasses import dataclass
 
 from calendar.calendar import Calendar
-from search import a_star, PathNotFoundError
-
-
-@dataclass(frozen=True)
-class MapTile:
-    x_coord: int
-    y_coord: int
-    height: str
+from mathx import Grid2D
+from search import Graph
 
 
 @Calendar.register(day=12)
@@ -17,8 +11,6 @@ class Solution:
     puzzle_input: str
 
     def __post_init__(self):
-        self.tiles: dict[tuple[int, int], MapTile] = {}
-
         # self.puzzle_input = """
         #     Sabqponm
         #     abcryxxl
@@ -27,56 +19,34 @@ class Solution:
         #     abdefghi
         # """
 
-        for row_ind, row in enumerate(self.puzzle_input.strip().split()):
-            for col_ind, height in enumerate(row):
-                def create_tile(_height: str):
-                    return MapTile(col_ind, row_ind, _height)
-
-                match height:
-                    case 'S':
-                        tile = create_tile('a')
-                        self.start_node = tile
-                    case 'E':
-                        tile = create_tile('z')
-                        self.goal_node = tile
-                    case _:
-                        tile = create_tile(height)
-
-                self.tiles[col_ind, row_ind] = tile
+        # Squares are flat indices into a grid of their heights
+        self.heights = Grid2D.parse(self.puzzle_input.strip())
+        self.start_node = self.heights.cells.index(ord('S'))
+        self.goal_node = self.heights.cells.index(ord('E'))
+        self.heights.cells[self.start_node] = ord('a')
+        self.heights.cells[self.goal_node] = ord('z')
 
-    def decode(self, height: str) -> int:
-        return ord(height) - ord('a')
+        self.graph = Graph.from_neighbours(range(len(self.heights)), self.get_neighbours)
 
-    def get_neighbours(self, tile: MapTile):
-        surrounding_tiles = [
-            self.tiles.get((tile.x_coord - 1, tile.y_coord), None),
-            self.tiles.get((tile.x_coord + 1, tile.y_coord), None),
-            self.tiles.get((tile.x_coord, tile.y_coord - 1), None),
-            self.tiles.get((tile.x_coord, tile.y_coord + 1), None)
-        ]
+    def get_neighbours(self, tile: int) -> list[int]:
+        cells = self.heights.cells
+        return [neighbour for neighbour in self.heights.neighbours(tile) if cells[neighbour] - cells[tile] <= 1]
 
-        return [
-            neighbour
-            for neighbour in surrounding_tiles
-            if neighbour is not None and self.decode(neighbour.height) - self.decode(tile.height) <= 1
-        ]
-
-    def tile_heuristic(self, tile: MapTile):
-        return float(abs(self.goal_node.x_coord - tile.x_coord) + abs(self.goal_node.y_coord - tile.y_coord))
+    def tile_heuristic(self, tile: int):
+        goal_x, goal_y = self.heights.position(self.goal_node)
+        x, y = self.heights.position(tile)
+        return float(abs(goal_x - x) + abs(goal_y - y))
 
     def part1(self):
-        path = a_star(self.start_node, self.goal_node, self.get_neighbours, self.tile_heuristic, lambda t1, t2: 1)
+        path = self.graph.a_star(
+            self.graph.ids[self.start_node], self.graph.ids[self.goal_node],
+            lambda tile_id: self.tile_heuristic(self.graph.nodes[tile_id])
+        )
         return path.length
 
     def part2(self):
-        all_paths = []
-
-        for start_node in filter(lambda tile: tile.height == 'a', self.tiles.values()):
-            try:
-                path = a_star(start_node, self.goal_node, self.get_neighbours, self.tile_heuristic, lambda t1, t2: 1)
-            except PathNotFoundError:
-                continue
-
-            all_paths.append(path)
-
-        return min(path.length for path in all_paths)
+        # Searching backwards from the goal scores every starting square at once
+        distances = self.graph.reversed().breadth_first_distances([self.graph.ids[self.goal_node]])
+        return int(min(
+            distance for tile, distance in zip(self.graph.nodes, distances) if self.heights.cells[tile] == ord('a')
+        ))
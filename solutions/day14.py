@@ -1,38 +1,14 @@
 import curses
-import math
-import queue
 from curses import wrapper
 from dataclasses import dataclass
-from itertools import pairwise, accumulate, starmap, takewhile, repeat, chain
-from queue import LifoQueue
-from typing import Iterable, Protocol, Optional
+from itertools import pairwise
+from typing import Iterable
 
 from calendar.calendar import Calendar
-from itertoolsx import flatten, iter_except
-from mathx import Vector
+from itertoolsx import flatten
+from mathx import Vector, IntVector, VectorArray, Grid2D
 
-
-class RockLine(Protocol):
-    def contains(self, point: Vector) -> bool:
-        ...
-
-
-@dataclass
-class HorizontalRockLine:
-    start: Vector
-    end: Vector
-
-    def contains(self, point: Vector) -> bool:
-        return point.y == self.start.y and self.start.x <= point.x <= self.end.x
-
-
-@dataclass
-class VerticalRockLine:
-    start: Vector
-    end: Vector
-
-    def contains(self, point: Vector) -> bool:
-        return point.x == self.start.x and self.start.y <= point.y <= self.end.y
+AIR, ROCK, SAND = 0, 1, 2
 
 
 @Calendar.register(day=14)
@@ -46,83 +22,66 @@ class Solution:
         #     503,4 -> 502,4 -> 502,9 -> 494,9
         # """
 
-        def parse_position(position_data: str) -> Vector:
-            return Vector(*map(int, position_data.strip().split(',')))
-
-        def parse_rock_line_endpoints(start: Vector, end: Vector) -> RockLine:
-            if start.x == end.x:
-                return VerticalRockLine(
-                    Vector(start.x, min(start.y, end.y)),
-                    Vector(end.x, max(start.y, end.y))
-                )
-
-            return HorizontalRockLine(
-                Vector(min(start.x, end.x), start.y),
-                Vector(max(start.x, end.x), end.y)
-            )
+        def parse_position(position_data: str) -> IntVector:
+            return IntVector(*map(int, position_data.strip().split(',')))
 
         def parse_rock_lines(line: str):
             return list(pairwise(map(parse_position, line.strip().split('->'))))
 
-        self.start_position = Vector(500, 0)
+        self.start_position = IntVector(500, 0)
         rock_lines_data = self.puzzle_input.strip().splitlines()
-        rock_line_endpoints = list(flatten(map(parse_rock_lines, rock_lines_data)))
-        self.rock_lines = list(starmap(parse_rock_line_endpoints, rock_line_endpoints))
-        self.bottom_edge = int(max(map(lambda coordinate: coordinate.y, flatten(rock_line_endpoints))))
-
-    def fall_down(self, sand_positions: set[Vector], start_position: Vector) -> Iterable[set[Vector]]:
-        return starmap(
-            lambda positions, current_position: set(chain(positions, [current_position])),
-            zip(repeat(sand_positions), takewhile(
-                lambda position: position,
-                accumulate(repeat(sand_positions), self.update_pos, initial=start_position)
-            ))
-        )
-
-    def simulate(self):
-        sand_path: LifoQueue[Vector] = LifoQueue()
-        world_map: dict[Vector, bool] = {}
-        sand_pile: set[Vector] = set()
-
-        fall_vectors = [Vector(0, 1), Vector(-1, 1), Vector(1, 1)]
-
-        def update_pos(current_position: Vector) -> Optional[Vector]:
-            potential_positions = map(lambda direction: direction + current_position, fall_vectors)
-            for position in potential_positions:
-                state = world_map.get(position, None)
-                if state is None:
-                    state = any(map(lambda rock_line: rock_line.contains(position), self.rock_lines))
-                    world_map[position] = state
-
-                if state:
-                    continue
-
-                return position
-
-            return None
-
-        sand_path.put_nowait(self.start_position)
-
-        for start_position in iter_except(sand_path.get_nowait, queue.Empty):
-            current_position = start_position
-
-            while True:
-                new_position = update_pos(current_position)
-                if not new_position:
+        self.rock_lines = list(flatten(map(parse_rock_lines, rock_lines_data)))
+        bounding_box = VectorArray.from_vectors(flatten(self.rock_lines)).bounding_box()
+        self.bottom_edge = int(bounding_box.position.y + bounding_box.size.y)
+
+        # Sand piles up at most as far to the sides as the floor is deep
+        floor_edge = self.bottom_edge + 2
+        self.origin = IntVector(self.start_position.x - floor_edge - 1, 0)
+        self.width = 2 * floor_edge + 3
+
+    def create_cave(self, floor: bool) -> Grid2D:
+        cave = Grid2D(self.width, self.bottom_edge + 3)
+
+        for start, end in self.rock_lines:
+            (start_x, start_y), (end_x, end_y) = start - self.origin, end - self.origin
+            # Rock outside the grid is out of reach for the sand, so that part of the line is left out
+            left, right = max(min(start_x, end_x), 0), min(max(start_x, end_x), cave.width - 1)
+            for y in range(min(start_y, end_y), max(start_y, end_y) + 1):
+                for x in range(left, right + 1):
+                    cave[x, y] = ROCK
+
+        if floor:
+            cave.row(cave.height - 1)[:] = bytes([ROCK]) * cave.width
+
+        return cave
+
+    def simulate(self, cave: Grid2D, bottom_edge: int) -> Iterable[IntVector]:
+        """Where every grain of sand comes to rest, until one falls below the bottom edge or the source is covered
+
+        The path of the last grain is kept, the next one starts falling from where that one was just before
+        it came to rest.
+        """
+        cells, width = cave.cells, cave.width
+        start = cave.index(*(self.start_position - self.origin))
+        sand_path = [start]
+        abyss = (bottom_edge + 1) * width
+
+        while sand_path:
+            index = sand_path[-1]
+
+            for below in (index + width, index + width - 1, index + width + 1):
+                if cells[below] == AIR:
+                    if below >= abyss:
+                        return
+
+                    sand_path.append(below)
                     break
+            else:
+                cells[index] = SAND
+                sand_path.pop()
+                yield cave.position(index) + self.origin
 
-                if new_position.y > self.bottom_edge:
-                    return
-
-                sand_path.put_nowait(current_position)
-                current_position = new_position
-
-            world_map[current_position] = True
-            sand_pile.add(current_position)
-
-            yield sand_pile.copy()
-
-    def display(self, simulation: list[set[Vector]]):
+    def display(self, simulation: list[Vector]):
         def inner(stdscr):
             pad_width = curses.COLS
             pad_height = self.bottom_edge
@@ -148,15 +107,14 @@ class Solution:
 
                 # Draw rocks
                 # for coordinate in self.rock_coordinates:
-                #     sim_pad.addch(int(coordinate.y), int(coordinate.x - self.boundary.position.x), '#')
+                #     sim_pad.addch(int(coordinate.y), int(coordinate.x - self.origin.x), '#')
 
                 # Draw source
-                # sim_pad.addch(int(self.start_position.y), int(self.start_position.x - self.boundary.position.x), '+')
+                # sim_pad.addch(int(self.start_position.y), int(self.start_position.x - self.origin.x), '+')
 
-                # Draw sand
-                current_frame = simulation[current_frame_ind]
-                for sand_position in current_frame:
-                    sim_pad.addch(int(sand_position.y), int(sand_position.x - self.boundary.position.x), 'o')
+                # Draw sand, every grain up to the current one
+                for sand_position in simulation[:current_frame_ind + 1]:
+                    sim_pad.addch(int(sand_position.y), int(sand_position.x - self.origin.x), 'o')
 
                 pad_refresh()
 
@@ -185,16 +143,8 @@ class Solution:
         wrapper(inner)
 
     def part1(self):
-        simulation = list(self.simulate())
-        return len(simulation[-1])
+        return sum(1 for _ in self.simulate(self.create_cave(floor=False), self.bottom_edge))
 
     def part2(self):
-        self.bottom_edge += 2
-        floor = HorizontalRockLine(
-            Vector(-math.inf, self.bottom_edge),
-            Vector(math.inf, self.bottom_edge)
-        )
-
-        self.rock_lines.append(floor)
-        simulation = list(self.simulate())
-        return len(simulation[-1])
\ No newline at end of file
+        floor_edge = self.bottom_edge + 2
+        return sum(1 for _ in self.simulate(self.create_cave(floor=True), floor_edge))
@@ -1,27 +1,117 @@
-import itertools
-import queue
+import operator
 import re
-from dataclasses import dataclass, field
-from functools import reduce
-from itertools import starmap, count
-from queue import Queue, PriorityQueue
-from typing import Iterable
+from dataclasses import dataclass
+from itertools import starmap
+from typing import Iterable, NamedTuple, Optional
 
 from calendar.calendar import Calendar
-from itertoolsx import iter_except, batched, flatten
-from search import a_star
+from calendar.scheduler import worker_budget
+from search import all_pairs_distances, parallel_branch_and_bound
 
 
-@dataclass(order=True)
-class ScoredValvePermutation:
-    open_valves: list[tuple[str, int]] = field(compare=False)
-    score: int
+class ValveState(NamedTuple):
+    """When and at which valve index each worker opened its last valve, sorted, and what open valves release"""
+    workers: tuple[tuple[int, int], ...]
+    opened: int
+    released: int
+    open_valves: tuple[tuple[str, int], ...]
 
 
-@Calendar.register(day=16)
+# The last valve opened with when, and the ones opened before it the same way
+OpenedValves = tuple[str, int, 'OpenedValves']
+
+
+def unwind(opened: Optional[OpenedValves]) -> list[tuple[str, int]]:
+    valves = []
+
+    while opened is not None:
+        valve_id, released_at, opened = opened
+        valves.append((valve_id, released_at))
+
+    return valves[::-1]
+
+
+@dataclass(frozen=True)
+class ValveSearch:
+    """Which valve the worker that's done first opens next, valves referred to by index
+
+    The pressurized valves come first, sorted by flow rate, and the first valve last.
+    """
+    end: int
+    valve_ids: list[str]
+    flow_rates: list[int]
+    distances: list[list[int]]
+    step: int
+
+    @classmethod
+    def create(cls, solution: 'Solution', end: int, first_valve: str) -> 'ValveSearch':
+        valve_ids = [*solution.pressurized_valves, first_valve]
+        distances = [
+            [int(solution.distances[last_valve, valve_id]) + 1 for valve_id in solution.pressurized_valves]
+            for last_valve in valve_ids
+        ]
+
+        # Opening one valve after another takes at least this long, moving there included
+        step = min((distance for row in distances[:-1] for distance in row if distance > 1), default=2)
+
+        return cls(end, valve_ids, [solution.valves[valve_id] for valve_id in solution.pressurized_valves], distances, step)
+
+    @property
+    def first_ind(self) -> int:
+        return len(self.valve_ids) - 1
+
+    def expand(self, state: ValveState) -> Iterable[ValveState]:
+        # The worker that's done first picks its next valve, or stops for the others to carry on
+        (total_time, last_ind), *other_workers = state.workers
+        if total_time >= self.end:
+            return []
+
+        children = []
+        for ind, distance in enumerate(self.distances[last_ind]):
+            new_total_time = total_time + distance
+            if state.opened & 1 << ind or new_total_time >= self.end:
+                continue
+
+            children.append(ValveState(
+                tuple(sorted([(new_total_time, ind), *other_workers])),
+                state.opened | 1 << ind,
+                state.released + self.flow_rates[ind] * (self.end - new_total_time),
+                (*state.open_valves, (self.valve_ids[ind], new_total_time))
+            ))
+
+        if other_workers and other_workers[0][0] < self.end:
+            children.append(state._replace(workers=(*other_workers, (self.end, last_ind))))
+
+        return children
+
+    def released(self, state: ValveState) -> int:
+        return state.released
+
+    def bound(self, state: ValveState) -> int:
+        # Highest flow rates first, opened at the earliest any worker could possibly open another valve
+        closed_flow_rates = [flow_rate for ind, flow_rate in enumerate(self.flow_rates) if not state.opened & 1 << ind]
+        remaining_times = []
+
+        for total_time, last_ind in state.workers:
+            nearest = min(
+                (distance for ind, distance in enumerate(self.distances[last_ind]) if not state.opened & 1 << ind),
+                default=self.end
+            )
+            remaining_times.extend(range(self.end - total_time - nearest, 0, -self.step))
+
+        remaining_times.sort(reverse=True)
+        return state.released + sum(map(operator.mul, closed_flow_rates, remaining_times))
+
+    def dominance(self, state: ValveState) -> tuple[tuple, int]:
+        return (state.workers, state.opened), state.released
+
+
+@Calendar.register(day=16, parallel=True)
 @dataclass
 class Solution:
     puzzle_input: str
+    # 'bitmask' runs the dynamic programming over opened valves, 'search' the branch and bound
+    solver: str = 'bitmask'
 
     def __post_init__(self):
         # self.puzzle_input = """
@@ -37,6 +127,9 @@ class Solution:
         #     Valve JJ has flow rate=21; tunnel leads to valve II
         # """
 
+        if self.solver not in ('bitmask', 'search'):
+            raise ValueError(f"Unknown solver {self.solver!r}, expected 'bitmask' or 'search'")
+
         self.layout: dict[str, list[str]] = {}
         self.valves: dict[str, int] = {}
 
@@ -68,132 +161,185 @@ class Solution:
             )
         )
 
+        self.distances = all_pairs_distances(self.layout, lambda valve_id: self.layout[valve_id])
+
     def calculate_released_pressure(self, after: int, open_valves: list[tuple[str, int]]):
         return sum(starmap(
             lambda valve_id, released_at: self.valves[valve_id] * max(0, after - released_at),
             open_valves)
         )
 
-    def find_shortest_distance(self, start: str, end: str) -> int:
-        result = a_star(
-            start, end,
-            lambda valve_id: self.layout[valve_id],
-            lambda valve_id: 0,
-            lambda valve1, valve2: 1
-        )
-        return int(result.length)
-
-    def find_best_permutation_before(self, end: int, first_valve: str, workers: int):
-        distances: dict[tuple[str, str], int] = {}
+    def find_best_permutation_before(self, end: int, first_valve: str, workers: int, processes: int = 1):
+        search = ValveSearch.create(self, end, first_valve)
+        root = ValveState(((0, search.first_ind),) * workers, 0, 0, ((first_valve, 0),) * workers)
 
-        expand_queue: PriorityQueue[ScoredValvePermutation] = PriorityQueue()
-        prune_queue: PriorityQueue[ScoredValvePermutation] = PriorityQueue()
-        prune_cache = {}
-
-        expand_queue.put_nowait(ScoredValvePermutation([(first_valve, 0)]*workers, 0))
-
-        best_permutation = []
-        best_score = 0
-
-        while not expand_queue.empty():
-            for permutation in iter_except(expand_queue.get_nowait, queue.Empty):
-                last_permutations = permutation.open_valves[-workers:]
-
-                open_valve_ids = list(starmap(lambda valve_id, _: valve_id, permutation.open_valves))
-                remaining_valves = list(filter(
-                    lambda valve_data: valve_data not in open_valve_ids,
-                    self.pressurized_valves
-                ))
-
-                for new_permutation in itertools.permutations(remaining_valves, workers):
-                    new_open_valves = permutation.open_valves.copy()
-
-                    for last_valve_opening, valve_id in zip(last_permutations, new_permutation):
-                        last_valve, total_time = last_valve_opening
-                        distance = distances.get((last_valve, valve_id), None)
-                        if distance is None:
-                            distance = self.find_shortest_distance(last_valve, valve_id)
-                            distances[last_valve, valve_id] = distance
-                            distances[valve_id, last_valve] = distance
-
-                        new_total_time = total_time + distance + 1
-
-                        if new_total_time >= end:
-                            continue
-
-                        new_open_valves.append((valve_id, new_total_time))
-
-                    released = self.calculate_released_pressure(after=end, open_valves=new_open_valves)
-
-                    if released > best_score:
-                        best_score = released
-                        best_permutation = new_open_valves
-                        print(best_permutation, best_score)
-
-                    prune_queue.put_nowait(
-                        ScoredValvePermutation(open_valves=new_open_valves, score=-released)
-                    )
-
-            for permutation in iter_except(prune_queue.get_nowait, queue.Empty):
-                last_valves = permutation.open_valves[-workers:]
-                last_valve_ids = [valve_id for valve_id, opening_time in last_valves]
-                total_times = sorted(opening_time for valve_id, opening_time in last_valves)
-                current_pressure_released = -permutation.score
-
-                open_valve_ids = list(starmap(lambda valve_id, _: valve_id, permutation.open_valves))
-                remaining_valves = tuple(filter(
-                    lambda valve_data: valve_data not in open_valve_ids,
-                    self.pressurized_valves
-                ))
+        best_state, best_score = parallel_branch_and_bound(
+            root, search.expand, search.released, search.bound, search.dominance, order='best', workers=processes
+        )
 
-                if current_pressure_released <= prune_cache.get(remaining_valves, 0):
+        return list(best_state.open_valves), best_score
+
+    def find_best_pressures(
+            self, end: int, first_valve: str, prune: bool = False, beat: int = -1
+    ) -> dict[int, tuple[int, Optional[OpenedValves]]]:
+        """The most pressure a single worker can release opening exactly the valves of each mask, and how
+
+        Pressurized valve i is bit i of the masks. The best pressure is kept per (position, time left, mask)
+        and the states are expanded latest time left first, so every state is final by the time it's expanded.
+        A state is also skipped if one at the same position with the same mask, but more time left, released
+        at least as much.
+
+        States that can't release more than beat are skipped, and with pruning those that can't beat the
+        most pressure released so far as well. The masks only such states lead to may then be missing or
+        come out too low.
+        """
+        search = ValveSearch.create(self, end, first_valve)
+        # Nearest valves first, so the moves that take too long are the last ones
+        moves = [
+            sorted(((distance, 1 << ind, ind, search.flow_rates[ind]) for ind, distance in enumerate(row)))
+            for row in search.distances
+        ]
+
+        # Highest flow rates first, opened at the earliest another valve could be, the nearest one from the
+        # position whether it's open or not
+        flow_rates = [(1 << ind, flow_rate) for ind, flow_rate in enumerate(search.flow_rates)]
+        nearest = [min(row, default=end) for row in search.distances]
+
+        def bound(position: int, time_left: int, mask: int, released: int) -> int:
+            closed_flow_rates = [flow_rate for bit, flow_rate in flow_rates if not mask & bit]
+            remaining_times = range(time_left - nearest[position], 0, -search.step)
+            return released + sum(map(operator.mul, closed_flow_rates, remaining_times))
+
+        # Per time left, (position, mask) -> (released, opened valves)
+        states: list[dict[tuple[int, int], tuple[int, Optional[OpenedValves]]]] = [{} for _ in range(end + 1)]
+        states[end][search.first_ind, 0] = (0, None)
+        best_pressures: dict[int, tuple[int, Optional[OpenedValves]]] = {}
+        expanded: dict[tuple[int, int], int] = {}
+        most_released = 0
+
+        for time_left in range(end, 0, -1):
+            for key, best in states[time_left].items():
+                released, opened = best
+                if released <= expanded.get(key, -1):
                     continue
 
-                prune_cache[remaining_valves] = current_pressure_released
-
-                # ideal_permutation, ideal_pressure_released = self.find_best_permutation_before(
-                #     end=end-total_times[0],
-                #     first_valves=last_valve_ids,
-                #     valves=remaining_valves
-                # )
-
-                min_dist = min(
-                    distances.get((last_valve, remaining_valve[0]), 1)
-                    for last_valve, remaining_valve in
-                    itertools.product(last_valve_ids, remaining_valves)
-                )
-
-                ideal_permutations = list(zip(*batched(remaining_valves, workers)))
-
-                ideal_opening_times = [count(total_time + min_dist + 1, 2) for total_time in total_times]
-                ideal_openings = list(flatten(starmap(
-                    lambda ideal_permutation, counter: [
-                        (valve_id, opening_time)
-                        for valve_id, opening_time in zip(ideal_permutation, counter)
-                        if opening_time < end
-                    ],
-                    zip(ideal_permutations, ideal_opening_times)
-                )))
-
-                ideal_pressure_released = self.calculate_released_pressure(
-                    after=end,
-                    open_valves=ideal_openings
-                )
-
-                combined_ideal_pressure_released = ideal_pressure_released + current_pressure_released
+                expanded[key] = released
+                position, mask = key
+                if released > best_pressures.get(mask, (-1,))[0]:
+                    best_pressures[mask] = best
 
-                if combined_ideal_pressure_released < best_score:
-                    break
+                threshold = max(beat, most_released) if prune else beat
+                if threshold >= 0 and bound(position, time_left, mask, released) <= threshold:
+                    continue
 
-                expand_queue.put_nowait(permutation)
-                # print(permutation, remaining_valves, combined_ideal_pressure_released, best_score)
+                for distance, bit, ind, flow_rate in moves[position]:
+                    if distance >= time_left:
+                        break
+
+                    if mask & bit:
+                        continue
+
+                    new_time_left = time_left - distance
+                    new_released = released + flow_rate * new_time_left
+                    new_states = states[new_time_left]
+                    key = (ind, mask | bit)
+
+                    if new_released > new_states.get(key, (-1,))[0]:
+                        new_states[key] = (new_released, (search.valve_ids[ind], end - new_time_left, opened))
+                        if new_released > most_released:
+                            most_released = new_released
+
+        return best_pressures
+
+    def find_best_disjoint_pair(
+            self, best_pressures: dict[int, tuple[int, Optional[OpenedValves]]], valve_count: Optional[int] = None
+    ) -> tuple[int, tuple[int, int]]:
+        """The disjoint pair of masks that release the most pressure together, and how much
+
+        Every mask is paired with the best of the subsets of the valves it leaves closed, which are found
+        for all of them at once, each bit at a time, in O(2^k * k) for k pressurized valves. One mask of a
+        disjoint pair lacks the last valve, so only the subsets without it are needed. With a valve count
+        only the masks of that many first valves are paired.
+        """
+        valve_count = len(self.pressurized_valves) if valve_count is None else valve_count
+        all_valves = (1 << valve_count) - 1
+        best_pressures = {mask: best for mask, best in best_pressures.items() if mask <= all_valves}
+        subset_valves = all_valves >> 1
+
+        # The best pressure among the subsets of every mask without the last valve, packed with its mask
+        best_subsets = [0] * (subset_valves + 1)
+        for mask, (released, _) in best_pressures.items():
+            if mask <= subset_valves:
+                best_subsets[mask] = released << valve_count | mask
+
+        for bit_ind in range(valve_count - 1):
+            bit = 1 << bit_ind
+            stride = bit << 1
+            # The masks with the bit set, next to the ones without it, are either a few strided runs or many
+            # short blocks
+            if bit * stride <= len(best_subsets):
+                halves = [(slice(bit + offset, None, stride), slice(offset, None, stride)) for offset in range(bit)]
+            else:
+                halves = [
+                    (slice(start + bit, start + stride), slice(start, start + bit))
+                    for start in range(0, len(best_subsets), stride)
+                ]
+
+            for with_bit, without_bit in halves:
+                best_subsets[with_bit] = [
+                    best if best > other else other
+                    for best, other in zip(best_subsets[with_bit], best_subsets[without_bit])
+                ]
+
+        best_score, best_masks = -1, (0, 0)
+        for mask, (released, _) in best_pressures.items():
+            other = best_subsets[~mask & subset_valves]
+            if released + (other >> valve_count) > best_score:
+                best_score, best_masks = released + (other >> valve_count), (mask, other & all_valves)
+
+        return best_score, best_masks
+
+    def find_best_disjoint_pressures(self, end: int, first_valve: str) -> tuple[list[tuple[str, int]], int]:
+        """Two workers never open the same valve, so the best pair of disjoint masks is the best they can do
+
+        The masks a single worker finds with pruning already pair up into a score to beat. Neither worker
+        releases more than the best single one, so the masks of both are then searched skipping the states
+        that can't release more than that score minus the best single one.
+        """
+        singles = self.find_best_pressures(end, first_valve, prune=True)
+        most_released = max(released for released, _ in singles.values())
+        # The valves with the 16 highest flow rates are plenty for a score close to the best, and pair quickly
+        pair_score, pair_masks = self.find_best_disjoint_pair(singles, min(len(self.pressurized_valves), 16))
+
+        best_pressures = self.find_best_pressures(end, first_valve, beat=pair_score - most_released)
+        best_score, best_masks = self.find_best_disjoint_pair(best_pressures)
+        if best_score <= pair_score:
+            best_score, best_masks, best_pressures = pair_score, pair_masks, singles
+
+        best_permutation = sorted(
+            [*unwind(best_pressures[best_masks[0]][1]), *unwind(best_pressures[best_masks[1]][1])],
+            key=lambda valve: valve[1]
+        )
 
-        return best_permutation, best_score
+        return [(first_valve, 0), (first_valve, 0), *best_permutation], best_score
 
     def part1(self):
-        best_permutation, score = self.find_best_permutation_before(end=30, first_valve='AA', workers=1)
+        if self.solver == 'search':
+            best_permutation, score = self.find_best_permutation_before(end=30, first_valve='AA', workers=1)
+        else:
+            score, opened = max(
+                self.find_best_pressures(end=30, first_valve='AA', prune=True).values(), key=lambda best: best[0]
+            )
+            best_permutation = [('AA', 0), *unwind(opened)]
+
         return best_permutation, score, {valve_id: self.valves[valve_id] for valve_id, t in best_permutation}
 
     def part2(self):
-        best_permutation, score = self.find_best_permutation_before(end=26, first_valve='AA', workers=2)
+        if self.solver == 'search':
+            best_permutation, score = self.find_best_permutation_before(
+                end=26, first_valve='AA', workers=2, processes=worker_budget()
+            )
+        else:
+            best_permutation, score = self.find_best_disjoint_pressures(end=26, first_valve='AA')
+
         return best_permutation, score, {valve_id: self.valves[valve_id] for valve_id, t in best_permutation}
@@ -6,24 +6,24 @@ from typing import Iterable, Protocol
 import mathx
 from calendar.calendar import Calendar
 from itertoolsx import take
-from mathx import Vector
+from mathx import IntVector
 
 
 class Action(Protocol):
-    def apply(self, position: Vector) -> Vector:
+    def apply(self, position: IntVector) -> IntVector:
         ...
 
 
 class FallDownAction:
-    def apply(self, position: Vector) -> Vector:
-        return position + Vector(0, -1)
+    def apply(self, position: IntVector) -> IntVector:
+        return position + IntVector(0, -1)
 
 
 @dataclass
 class JetPushAction:
-    push: Vector
+    push: IntVector
 
-    def apply(self, position: Vector) -> Vector:
+    def apply(self, position: IntVector) -> IntVector:
         return position + self.push
 
 
@@ -61,16 +61,16 @@ class Solution:
             ]
         )
 
-    def jet_shape_to_vector(self, shape: str) -> Vector:
+    def jet_shape_to_vector(self, shape: str) -> IntVector:
         match shape:
             case '>':
-                return Vector(1, 0)
+                return IntVector(1, 0)
             case '<':
-                return Vector(-1, 0)
+                return IntVector(-1, 0)
 
         raise ValueError("Incorrect jet shape")
 
-    def check_collision(self, position: Vector, shape: list[int], world_state: list[int]):
+    def check_collision(self, position: IntVector, shape: list[int], world_state: list[int]):
         if position.x < 0 or position.y < 0:
             return True
 
@@ -84,14 +84,14 @@ class Solution:
 
         return False
 
-    def apply_action(self, position: Vector, action: Action, *_, shape: list[int], world_state: list[int]) -> Vector:
+    def apply_action(self, position: IntVector, action: Action, *_, shape: list[int], world_state: list[int]) -> IntVector:
         new_position = action.apply(position)
         if self.check_collision(new_position, shape, world_state):
             return position
 
         return new_position
 
-    def simulate_round(self, position: Vector, actions: Iterable[Action], *_, shape: list[int], world_state: list[int]) -> tuple[Vector, Vector]:
+    def simulate_round(self, position: IntVector, actions: Iterable[Action], *_, shape: list[int], world_state: list[int]) -> tuple[IntVector, IntVector]:
         prev_position = None
         current_position = position
 
@@ -102,7 +102,7 @@ class Solution:
         return prev_position, current_position
 
     def simulate_sequence(self, top_line: int, shape: list[int], *_, actions: Iterable[Iterable[Action]], world_state: list[int]) -> int:
-        current_position = Vector(2, top_line + 4)
+        current_position = IntVector(2, top_line + 4)
 
         if len(world_state) < top_line + 100:
             world_state.extend([0b00000000]*100)
@@ -1,24 +1,126 @@
+import itertools
 import operator
-import queue
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from functools import reduce
-from itertools import starmap
-from queue import Queue
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 from calendar.calendar import Calendar
-from itertoolsx import iter_except, dotproduct
+from calendar.scheduler import worker_budget
+from search import parallel_branch_and_bound
 
 ResourceGroup = tuple[int, int, int, int]
-Action = tuple[int, int]
-Strategy = tuple[Action, ...]
 Blueprint = tuple[ResourceGroup, ResourceGroup, ResourceGroup, ResourceGroup]
 
 
-@Calendar.register(day=19)
+class FactoryState(NamedTuple):
+    """Robots and resources at the end of a minute, ore first and geodes last"""
+    minute: int
+    robots: ResourceGroup
+    resources: ResourceGroup
+
+
+@dataclass(frozen=True)
+class GeodeSearch:
+    """Which robot to wait for and build next, states scored by the geodes they end with when nothing more is built
+
+    More ore, clay or obsidian robots than the most of it a robot costs can't be spent, so none are built
+    beyond that. Geodes aren't spent at all, a geode robot is always worth trying.
+    """
+    blueprint: Blueprint
+    minutes: int
+    max_robots: tuple[int, int, int]
+
+    @classmethod
+    def create(cls, blueprint: Blueprint, minutes: int) -> 'GeodeSearch':
+        max_robots = tuple(max(costs) for costs in zip(*blueprint))
+        return cls(blueprint, minutes, max_robots[:3])
+
+    def root(self) -> FactoryState:
+        return FactoryState(0, (1, 0, 0, 0), (0, 0, 0, 0))
+
+    def expand(self, state: FactoryState) -> list[FactoryState]:
+        minute, robots, resources = state
+        remaining = self.minutes - minute
+        children = []
+
+        # Geode robots first, so depth first finds good states early
+        for robot_id in range(3, -1, -1):
+            # Nor beyond what's left to spend on them
+            if robot_id < 3:
+                max_robots = self.max_robots[robot_id]
+                if robots[robot_id] >= max_robots \
+                        or resources[robot_id] >= (max_robots - robots[robot_id]) * remaining:
+                    continue
+
+            wait = 0
+            for cost, resource, robot_count in zip(self.blueprint[robot_id], resources, robots):
+                if cost > resource:
+                    if not robot_count:
+                        break
+
+                    wait = max(wait, -((resource - cost) // robot_count))
+            else:
+                # Built during the minute after waiting, a robot built in the last minute does nothing
+                built = minute + wait + 1
+                if built >= self.minutes:
+                    continue
+
+                children.append(FactoryState(
+                    built,
+                    (*robots[:robot_id], robots[robot_id] + 1, *robots[robot_id + 1:]),
+                    tuple(
+                        resource + robot_count * (wait + 1) - cost
+                        for resource, robot_count, cost in zip(resources, robots, self.blueprint[robot_id])
+                    )
+                ))
+
+        return children
+
+    def geodes(self, state: FactoryState) -> int:
+        return state.resources[3] + state.robots[3] * (self.minutes - state.minute)
+
+    def bound(self, state: FactoryState) -> int:
+        # Every minute a clay robot is built for free, and an obsidian and a geode robot paying only clay
+        # and obsidian, as often as those last
+        _, clay_robots, obsidian_robots, geode_robots = state.robots
+        _, clay, obsidian, geodes = state.resources
+        obsidian_cost, geode_cost = self.blueprint[2][1], self.blueprint[3][2]
+
+        for _ in range(state.minute, self.minutes):
+            build_obsidian, build_geode = clay >= obsidian_cost, obsidian >= geode_cost
+            clay, obsidian, geodes = clay + clay_robots, obsidian + obsidian_robots, geodes + geode_robots
+            clay_robots += 1
+
+            if build_obsidian:
+                clay -= obsidian_cost
+                obsidian_robots += 1
+
+            if build_geode:
+                obsidian -= geode_cost
+                geode_robots += 1
+
+        return geodes
+
+
+def find_max_geodes(blueprint: Blueprint, minutes: int, processes: int = 1) -> int:
+    search = GeodeSearch.create(blueprint, minutes)
+    _, max_geodes = parallel_branch_and_bound(
+        search.root(), search.expand, search.geodes, search.bound, workers=processes
+    )
+    return max_geodes
+
+
+# Hears of every blueprint evaluated: its id, the most geodes it cracks, how many are done and out of how many
+BlueprintProgress = Callable[[int, int, int, int], None]
+
+
+@Calendar.register(day=19, parallel=True)
 @dataclass
 class Solution:
     puzzle_input: str
+    progress: Optional[BlueprintProgress] = None
 
     def __post_init__(self):
         # self.puzzle_input = """
@@ -48,90 +150,45 @@ class Solution:
 
         self.blueprints = dict(map(parse_blueprint, self.puzzle_input.strip().splitlines()))
 
-    def simulate(self, strategy: Strategy, blueprint: Blueprint, minutes: int) -> ResourceGroup:
-        resources = [minutes, 0, 0, 0]
+    def evaluate_blueprints(self, blueprint_ids: Iterable[int], minutes: int) -> Iterator[tuple[int, int]]:
+        """The most geodes every blueprint cracks as (blueprint id, geodes), in the order they finish
 
-        for robot_id, build_time in strategy:
-            gain = minutes - build_time
-            cost = blueprint[robot_id]
+        Blueprints are evaluated side by side in worker_budget() processes, the progress hook hears of every
+        one along with how many are done out of how many.
+        """
+        blueprint_ids = list(blueprint_ids)
+        workers = min(worker_budget(), len(blueprint_ids))
 
-            resources[robot_id] += gain
-            resources = list(map(operator.sub, resources, cost))
+        if workers <= 1:
+            results = ((blueprint_id, find_max_geodes(self.blueprints[blueprint_id], minutes))
+                       for blueprint_id in blueprint_ids)
+            yield from self.report(results, len(blueprint_ids))
+            return
 
-        return tuple(resources)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(find_max_geodes, self.blueprints[blueprint_id], minutes): blueprint_id
+                for blueprint_id in blueprint_ids
+            }
+            results = ((futures[future], future.result()) for future in as_completed(futures))
+            yield from self.report(results, len(blueprint_ids))
 
-    def get_possible_actions(self, strategy: Strategy, blueprint: Blueprint, minutes: int) -> tuple[Action, ...]:
-        last_build_time = strategy[-1][-1] if strategy else 0
-        resources = self.simulate(strategy, blueprint, last_build_time)
-        possible_actions: dict[int, int] = {}
+    def report(self, results: Iterable[tuple[int, int]], total: int) -> Iterator[tuple[int, int]]:
+        for evaluated, (blueprint_id, max_geodes) in enumerate(results, 1):
+            if self.progress is not None:
+                self.progress(blueprint_id, max_geodes, evaluated, total)
 
-        for current_minute in range(last_build_time + 1, minutes):
-            for robot_id, costs in enumerate(blueprint):
-                if robot_id in possible_actions:
-                    continue
-
-                if not all(cost <= resource for cost, resource in zip(costs, resources)):
-                    continue
-
-                possible_actions[robot_id] = current_minute
-
-            resources = self.simulate(strategy, blueprint, current_minute)
-            # print(resources)
-
-        return tuple(map(lambda item: tuple(item), possible_actions.items()))
-
-    def find_max_geodes(self, blueprint: Blueprint, minutes: int):
-        points = (1, 10, 100, 1000)
-
-        hot_strategies: Queue[Strategy] = Queue()
-        hot_strategies.put_nowait(tuple())
-
-        max_geodes = 0
-        best_strategies: dict[tuple[Action, ...], int] = {}
-
-        for strategy in iter_except(hot_strategies.get_nowait, queue.Empty):
-            resources = self.simulate(strategy, blueprint, minutes)
-
-            if resources[3] > max_geodes:
-                max_geodes = resources[3]
-                # print(f"Max geodes cracked: {max_geodes} with strategy: {strategy}")
-
-            possible_actions = self.get_possible_actions(strategy, blueprint, minutes)
-
-            strategy_score = dotproduct(resources, points)
-            best_score = best_strategies.get(possible_actions, 0)
-
-            if strategy_score <= best_score:
-                continue
-
-            best_strategies[possible_actions] = strategy_score
-
-            # print(f"{strategy} | {resources} | {possible_actions}")
-
-            for possible_action in possible_actions:
-                new_strategy = tuple([*strategy, possible_action])
-                hot_strategies.put_nowait(new_strategy)
-
-        return max_geodes
+            yield blueprint_id, max_geodes
 
     def part1(self):
-        total_quality_level = 0
-
-        for blueprint_id, blueprint in self.blueprints.items():
-            print(f"Evaluating blueprint {blueprint_id}...")
-            max_geodes = self.find_max_geodes(blueprint, 24)
-            print(f"Max geodes cracked: {max_geodes}")
-
-            quality_level = blueprint_id * max_geodes
-            total_quality_level += quality_level
-
-        return total_quality_level
+        return sum(
+            blueprint_id * max_geodes
+            for blueprint_id, max_geodes in self.evaluate_blueprints(self.blueprints, 24)
+        )
 
     def part2(self):
-        max_geodes = list(map(
-            lambda blueprint: self.find_max_geodes(blueprint, 32),
-            list(self.blueprints.values())[:3]
-        ))
-        print(max_geodes)
+        max_geodes = map(
+            operator.itemgetter(1),
+            self.evaluate_blueprints(itertools.islice(self.blueprints, 3), 32)
+        )
         return reduce(operator.mul, max_geodes)
-
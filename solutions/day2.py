@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import triplewise
 
 from enum import Enum
@@ -25,13 +26,14 @@ class MyShapes(Enum):
     Z = 3
 
 
-@Calendar.register(day=2)
-@dataclass
+@Calendar.register(day=2, streaming=True)
+@dataclass(frozen=True)
 class Solution:
-    puzzle_input: str
+    strategy_guide: tuple[str, ...]
 
-    def __post_init__(self):
-        self.strategy_guide = self.puzzle_input.splitlines()
+    @classmethod
+    def parse(cls, puzzle_input: PuzzleInput) -> 'Solution':
+        return cls(tuple(puzzle_input.lines()))
 
     def part1(self):
         guessed_outcomes = map(
@@ -3,6 +3,7 @@ from itertools import cycle, dropwhile
 from typing import Optional
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import triplewise, take, nth
 
 
@@ -78,10 +79,10 @@ class MixerList:
             # print(list(take(self.count, map(lambda node: node.number, self))))
 
 
-@Calendar.register(day=20)
+@Calendar.register(day=20, streaming=True)
 @dataclass
 class Solution:
-    puzzle_input: str
+    puzzle_input: PuzzleInput
 
     def __post_init__(self):
         # self.puzzle_input = """
@@ -94,7 +95,7 @@ class Solution:
         #     4
         # """
 
-        self.content = list(map(int, self.puzzle_input.strip().splitlines()))
+        self.content = list(map(int, filter(None, map(str.strip, self.puzzle_input.lines()))))
 
     def part1(self):
         nodes = MixerList(self.content)
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import operator
 from asyncio import Future
 from dataclasses import dataclass, field
@@ -95,6 +96,26 @@ class BinaryOperatorExpression:
         return given.evaluate()
 
 
+def additive_inverse(operand: Expression) -> Expression:
+    return UnaryOperatorExpression(operator.neg, operand)
+
+
+def reciprocal(number: Fraction) -> Fraction:
+    return 1 / number
+
+
+def multiplicative_inverse(operand: Expression) -> Expression:
+    return UnaryOperatorExpression(reciprocal, operand)
+
+
+def addition(left: Expression, right: Expression) -> Expression:
+    return BinaryOperatorExpression(operator.add, (left, right), additive_inverse)
+
+
+def multiplication(left: Expression, right: Expression) -> Expression:
+    return BinaryOperatorExpression(operator.mul, (left, right), multiplicative_inverse)
+
+
 @Calendar.register(day=21)
 @dataclass
 class Solution:
@@ -119,18 +140,6 @@ class Solution:
         #     hmdt: 32
         # """
 
-        def additive_inverse(operand: Expression) -> Expression:
-            return UnaryOperatorExpression(operator.neg, operand)
-
-        def multiplicative_inverse(operand: Expression) -> Expression:
-            return UnaryOperatorExpression(lambda a: 1 / a, operand)
-
-        def addition(left: Expression, right: Expression) -> Expression:
-            return BinaryOperatorExpression(operator.add, (left, right), additive_inverse)
-
-        def multiplication(left: Expression, right: Expression) -> Expression:
-            return BinaryOperatorExpression(operator.mul, (left, right), multiplicative_inverse)
-
         operators = {
             '+': addition,
             '-': lambda left, right: addition(left, additive_inverse(right)),
@@ -155,8 +164,11 @@ class Solution:
                     future = expressions.setdefault(expression_id, Future())
                     future.set_result(operator_builder(left_expression, right_expression))
 
+        async def parse_expressions(data: list[str]) -> None:
+            await asyncio.gather(*map(parse_expression, data))
+
         content = self.puzzle_input.strip().splitlines()
-        asyncio.run(asyncio.wait(map(parse_expression, content)))
+        asyncio.run(parse_expressions(content))
         self.expressions: dict[str, Expression] = {
             expression_id: future.result()
             for expression_id, future in expressions.items()
@@ -172,12 +184,13 @@ class Solution:
         root = self.expressions['root']
         result = root.solve_for(human)
 
-        # Check result
+        # Check result on a copy, the parsed expressions are shared with part 1
 
-        human.number = result
-        root.operator = operator.sub
+        checked_human, checked_root = copy.deepcopy((human, root))
+        checked_human.number = result
+        checked_root.operator = operator.sub
 
-        assert root.evaluate() == 0
+        assert checked_root.evaluate() == 0
 
         return result
 
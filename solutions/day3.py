@@ -2,16 +2,18 @@ from dataclasses import dataclass
 from functools import reduce
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import batched
 
 
-@Calendar.register(day=3)
-@dataclass
+@Calendar.register(day=3, streaming=True)
+@dataclass(frozen=True)
 class Solution:
-    puzzle_input: str
+    rucksacks: tuple[str, ...]
 
-    def __post_init__(self):
-        self.rucksacks = self.puzzle_input.splitlines()
+    @classmethod
+    def parse(cls, puzzle_input: PuzzleInput) -> 'Solution':
+        return cls(tuple(puzzle_input.lines()))
 
     @staticmethod
     def get_priority(item: str):
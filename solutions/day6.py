@@ -1,28 +1,27 @@
 from dataclasses import dataclass
 
 from calendar.calendar import Calendar
+from calendar.puzzle_input import PuzzleInput
 from itertoolsx import window, first
 
 
-@Calendar.register(day=6)
+@Calendar.register(day=6, streaming=True)
 @dataclass
 class Solution:
-    puzzle_input: str
-
-    def __post_init__(self):
-        self.buffer = self.puzzle_input.strip()
-
-        print(self.buffer)
+    puzzle_input: PuzzleInput
 
     @staticmethod
-    def first_distinct(buffer, n) -> tuple[int, tuple[str]]:
+    def first_distinct(buffer: memoryview, n) -> tuple[int, tuple[str]]:
         ind, marker = first(enumerate(window(buffer, n)), pred=lambda i_w: len(set(i_w[1])) == n)
-        return ind + n, marker
+        return ind + n, tuple(map(chr, marker))
 
+    # The input is mapped only while a part scans it, so the solution holds no map and pickles
     def part1(self):
-        return self.first_distinct(self.buffer, 4)
+        with self.puzzle_input.mapped() as buffer:
+            return self.first_distinct(buffer, 4)
 
     def part2(self):
-        return self.first_distinct(self.buffer, 14)
+        with self.puzzle_input.mapped() as buffer:
+            return self.first_distinct(buffer, 14)
 
 
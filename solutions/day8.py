@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from itertools import islice
 
 from calendar.calendar import Calendar
 from itertoolsx import takewhile_inclusive
+from mathx import Grid2D
 
 
 @Calendar.register(day=8)
@@ -11,52 +11,51 @@ class Solution:
     puzzle_input: str
 
     def __post_init__(self):
-        self.tree_grid = [
-            list(map(int, row.strip()))
-            for row in self.puzzle_input.strip().splitlines()
-        ]
+        self.tree_grid = Grid2D.parse(self.puzzle_input.strip(), bytes.maketrans(b'0123456789', bytes(range(10))))
 
     def is_visible(self, i, j):
-        height = self.tree_grid[i][j]
+        height = self.tree_grid[j, i]
+        row, column = self.tree_grid.row(i), self.tree_grid.column(j)
 
         visible_from_above = all(
-            height > row[j]
-            for row in islice(self.tree_grid, i)
+            height > current_height
+            for current_height in column[:i]
         )
 
         visible_from_below = all(
-            height > row[j]
-            for row in islice(self.tree_grid, i + 1, None)
+            height > current_height
+            for current_height in column[i + 1:]
         )
 
         visible_from_left = all(
             height > current_height
-            for current_height in islice(self.tree_grid[i], j)
+            for current_height in row[:j]
         )
 
         visible_from_right = all(
             height > current_height
-            for current_height in islice(self.tree_grid[i], j + 1, None)
+            for current_height in row[j + 1:]
         )
 
         return visible_from_above or visible_from_below or visible_from_left or visible_from_right
 
     def scenic_score(self, i, j):
-        height = self.tree_grid[i][j]
+        height = self.tree_grid[j, i]
+        row, column = self.tree_grid.row(i), self.tree_grid.column(j)
 
         top_score = sum(
             1
             for _ in takewhile_inclusive(
-                lambda row: row[j] < height,
-                reversed(list(islice(self.tree_grid, i)))
+                lambda current_height: current_height < height,
+                column[i - 1::-1] if i else ()
             )
         )
 
         bottom_score = sum(
             1
             for _ in takewhile_inclusive(
-                lambda row: row[j] < height,
-                islice(self.tree_grid, i + 1, None)
+                lambda current_height: current_height < height,
+                column[i + 1:]
             )
         )
 
@@ -64,7 +63,7 @@ class Solution:
             1
             for _ in takewhile_inclusive(
                 lambda current_height: current_height < height,
-                reversed(list(islice(self.tree_grid[i], j)))
+                row[j - 1::-1] if j else ()
             )
         )
 
@@ -72,7 +71,7 @@ class Solution:
             1
             for _ in takewhile_inclusive(
                 lambda current_height: current_height < height,
-                islice(self.tree_grid[i], j + 1, None)
+                row[j + 1:]
             )
         )
 
@@ -81,16 +80,14 @@ class Solution:
     def part1(self):
         return sum(
             1
-            for i, row in enumerate(self.tree_grid)
-            for j, height in enumerate(row)
+            for i in range(self.tree_grid.height)
+            for j in range(self.tree_grid.width)
             if self.is_visible(i, j)
         )
 
     def part2(self):
         return max(
             self.scenic_score(i, j)
-            for i, row in enumerate(self.tree_grid)
-            for j, height in enumerate(row)
+            for i in range(self.tree_grid.height)
+            for j in range(self.tree_grid.width)
         )
-
-
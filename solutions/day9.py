@@ -5,7 +5,7 @@ from typing import Iterable
 
 from calendar.calendar import Calendar
 from itertoolsx import tail, flatten
-from mathx import Vector
+from mathx import IntVector, VectorArray
 
 
 @Calendar.register(day=9)
@@ -14,33 +14,33 @@ class Solution:
     puzzle_input: str
 
     def __post_init__(self):
-        def parse_move(move: str) -> Iterable[Vector]:
+        def parse_move(move: str) -> Iterable[IntVector]:
             direction, steps = move.strip().split(' ')
             unit_vector = unit_vectors[direction]
             return repeat(unit_vector, int(steps))
 
-        unit_vectors: dict[str, Vector] = {
-            'L': Vector(-1, 0),
-            'R': Vector(1, 0),
-            'U': Vector(0, -1),
-            'D': Vector(0, 1)
+        unit_vectors: dict[str, IntVector] = {
+            'L': IntVector(-1, 0),
+            'R': IntVector(1, 0),
+            'U': IntVector(0, -1),
+            'D': IntVector(0, 1)
         }
 
         moves = list(chain.from_iterable(map(parse_move, self.puzzle_input.strip().splitlines())))
-        self.head_positions = list(accumulate(moves, initial=Vector(0, 0)))
+        self.head_positions = VectorArray.from_vectors([IntVector(0, 0), *moves]).accumulate().to_vectors()
 
     @staticmethod
-    def get_node_position(current_head_position: Vector, current_node_position: Vector) -> Vector:
+    def get_node_position(current_head_position: IntVector, current_node_position: IntVector) -> IntVector:
         dx, dy = current_head_position - current_node_position
         tx = (abs(dx - 1) - abs(dx + 1)) // 2 * (1 - (abs(abs(dy) - abs(dx)) + abs(dy) - abs(dx)) // 2)
         ty = (abs(dy - 1) - abs(dy + 1)) // 2 * (1 - (abs(abs(dx) - abs(dy)) + abs(dx) - abs(dy)) // 2)
-        return current_head_position + Vector(tx, ty)
+        return current_head_position + IntVector(tx, ty)
 
-    def update_tail_positions(self, current_tail_positions: Iterable[Vector], current_head_position: Vector):
+    def update_tail_positions(self, current_tail_positions: Iterable[IntVector], current_head_position: IntVector):
         return tuple(islice(accumulate(current_tail_positions, self.get_node_position, initial=current_head_position), 1, None))
 
     def get_tail_positions(self, n: int):
-        initial_tail_positions = (Vector(0, 0),) * n
+        initial_tail_positions = (IntVector(0, 0),) * n
         return tuple(islice(accumulate(self.head_positions, self.update_tail_positions, initial=initial_tail_positions), 1, None))
 
     def part1(self):
@@ -0,0 +1,85 @@
+from collections import deque
+
+import pytest
+
+from calendar import generators
+from solutions.day16 import Solution
+
+EXAMPLE = """\
+Valve AA has flow rate=0; tunnels lead to valves DD, II, BB
+Valve BB has flow rate=13; tunnels lead to valves CC, AA
+Valve CC has flow rate=2; tunnels lead to valves DD, BB
+Valve DD has flow rate=20; tunnels lead to valves CC, AA, EE
+Valve EE has flow rate=3; tunnels lead to valves FF, DD
+Valve FF has flow rate=0; tunnels lead to valves EE, GG
+Valve GG has flow rate=0; tunnels lead to valves FF, HH
+Valve HH has flow rate=22; tunnel leads to valve GG
+Valve II has flow rate=0; tunnels lead to valves AA, JJ
+Valve JJ has flow rate=21; tunnel leads to valve II
+"""
+
+SOLVERS = ['bitmask', 'search']
+
+
+def brute_force_released(solution: Solution, end: int) -> dict[frozenset[str], int]:
+    """The most pressure released from AA by every set of valves opened in some order, trying all of the orders"""
+    def distances_from(start: str) -> dict[str, int]:
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            valve_id = queue.popleft()
+            for neighbour in solution.layout[valve_id]:
+                if neighbour not in distances:
+                    distances[neighbour] = distances[valve_id] + 1
+                    queue.append(neighbour)
+        return distances
+
+    pressurized = [valve_id for valve_id, flow_rate in solution.valves.items() if flow_rate]
+    distances = {valve_id: distances_from(valve_id) for valve_id in ['AA', *pressurized]}
+    best: dict[frozenset[str], int] = {}
+
+    def search(position: str, minute: int, opened: frozenset[str], released: int):
+        best[opened] = max(best.get(opened, 0), released)
+
+        for valve_id in pressurized:
+            # A minute to walk every tunnel and one to open the valve
+            opened_at = minute + distances[position][valve_id] + 1
+            if valve_id not in opened and opened_at < end:
+                search(valve_id, opened_at, opened | {valve_id}, released + solution.valves[valve_id] * (end - opened_at))
+
+    search('AA', 0, frozenset(), 0)
+    return best
+
+
+def brute_force(solution: Solution) -> tuple[int, int]:
+    alone = max(brute_force_released(solution, 30).values())
+    released = brute_force_released(solution, 26)
+    together = max(
+        first + second
+        for first_opened, first in released.items()
+        for second_opened, second in released.items()
+        if not first_opened & second_opened
+    )
+    return alone, together
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+def test_example(solver):
+    solution = Solution(EXAMPLE, solver=solver)
+    assert solution.part1()[1] == 1651
+    assert solution.part2()[1] == 1707
+
+
+@pytest.mark.parametrize('solver', SOLVERS)
+@pytest.mark.parametrize('scale, seed', [(4, 0), (8, 1), (16, 2), (24, 3), (32, 4), (36, 5), (44, 6)])
+def test_matches_brute_force(solver, scale, seed):
+    solution = Solution('\n'.join(generators.generate(16, scale, seed)), solver=solver)
+    alone, together = brute_force(solution)
+
+    best_permutation, score, _ = solution.part1()
+    assert score == alone
+    assert solution.calculate_released_pressure(30, best_permutation) == score
+
+    best_permutation, score, _ = solution.part2()
+    assert score == together
+    assert solution.calculate_released_pressure(26, best_permutation) == score
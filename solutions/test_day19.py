@@ -0,0 +1,112 @@
+import functools
+
+import pytest
+
+from solutions.day19 import Blueprint, FactoryState, GeodeSearch, find_max_geodes
+
+EXAMPLE_BLUEPRINTS = [
+    ((4, 0, 0, 0), (2, 0, 0, 0), (3, 14, 0, 0), (2, 0, 7, 0)),
+    ((2, 0, 0, 0), (3, 0, 0, 0), (3, 8, 0, 0), (3, 0, 12, 0)),
+]
+
+# Cheap geode robots pile up enough geodes to trip a prune that treats geodes like a resource to spend
+CHEAP_GEODE_BLUEPRINTS = [
+    ((4, 0, 0, 0), (2, 0, 0, 0), (2, 8, 0, 0), (4, 0, 8, 0)),
+    ((3, 0, 0, 0), (4, 0, 0, 0), (2, 6, 0, 0), (4, 0, 6, 0)),
+    ((4, 0, 0, 0), (3, 0, 0, 0), (4, 5, 0, 0), (4, 0, 5, 0)),
+]
+
+
+def brute_force_max_geodes(blueprint: Blueprint, minutes: int) -> int:
+    """Every order of robots to build, capped only at the most ore, clay or obsidian a robot costs"""
+    max_robots = [max(costs) for costs in zip(*blueprint)]
+    best = 0
+
+    def search(minute: int, robots: tuple[int, ...], resources: tuple[int, ...]):
+        nonlocal best
+        remaining = minutes - minute
+        best = max(best, resources[3] + robots[3] * remaining)
+
+        # Even a geode robot every minute from now on can't do better
+        if resources[3] + robots[3] * remaining + remaining * (remaining - 1) // 2 <= best:
+            return
+
+        for robot_id, costs in enumerate(blueprint):
+            if robot_id < 3 and robots[robot_id] >= max_robots[robot_id]:
+                continue
+
+            short = [(cost - resource, robot_count)
+                     for cost, resource, robot_count in zip(costs, resources, robots) if cost > resource]
+            if any(not robot_count for _, robot_count in short):
+                continue
+
+            wait = max((-(-missing // robot_count) for missing, robot_count in short), default=0)
+            if minute + wait + 1 >= minutes:
+                continue
+
+            search(
+                minute + wait + 1,
+                tuple(robot_count + (ind == robot_id) for ind, robot_count in enumerate(robots)),
+                tuple(
+                    resource + robot_count * (wait + 1) - cost
+                    for resource, robot_count, cost in zip(resources, robots, costs)
+                )
+            )
+
+    search(0, (1, 0, 0, 0), (0, 0, 0, 0))
+    return best
+
+
+@pytest.mark.parametrize('blueprint, minutes, expected', [
+    (EXAMPLE_BLUEPRINTS[0], 24, 9),
+    (EXAMPLE_BLUEPRINTS[1], 24, 12),
+    (EXAMPLE_BLUEPRINTS[0], 32, 56),
+    (EXAMPLE_BLUEPRINTS[1], 32, 62),
+])
+def test_example(blueprint, minutes, expected):
+    assert find_max_geodes(blueprint, minutes) == expected
+
+
+@pytest.mark.parametrize('blueprint', CHEAP_GEODE_BLUEPRINTS)
+def test_matches_brute_force(blueprint):
+    assert find_max_geodes(blueprint, 32) == brute_force_max_geodes(blueprint, 32)
+
+
+def replay(blueprint: Blueprint, state: FactoryState, robot_id: int, minutes: int) -> list[FactoryState]:
+    """Minute by minute, the factory collecting until it can pay for the robot and then building it"""
+    minute, robots, resources = state
+    costs = blueprint[robot_id]
+    while minute < minutes:
+        affordable = all(resource >= cost for resource, cost in zip(resources, costs))
+        resources = tuple(
+            resource + robot_count - (cost if affordable else 0)
+            for resource, robot_count, cost in zip(resources, robots, costs)
+        )
+        minute += 1
+
+        if affordable:
+            robots = tuple(robot_count + (ind == robot_id) for ind, robot_count in enumerate(robots))
+            return [FactoryState(minute, robots, resources)]
+
+    return []
+
+
+@pytest.mark.parametrize('blueprint', [*EXAMPLE_BLUEPRINTS, *CHEAP_GEODE_BLUEPRINTS])
+def test_expand_matches_replay_and_bound_holds(blueprint):
+    search = GeodeSearch.create(blueprint, 22)
+
+    @functools.cache
+    def most_geodes(state: FactoryState) -> int:
+        return max([search.geodes(state), *map(most_geodes, search.expand(state))])
+
+    states = [search.root()]
+    while states:
+        state = states.pop()
+        assert search.bound(state) >= most_geodes(state)
+
+        children = search.expand(state)
+        for child in children:
+            robot_id = next(ind for ind, (before, after) in enumerate(zip(state.robots, child.robots)) if after > before)
+            assert replay(blueprint, state, robot_id, search.minutes) == [child]
+
+        states.extend(children)
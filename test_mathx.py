@@ -0,0 +1,180 @@
+from collections import deque
+from random import Random
+
+import pytest
+
+from mathx import Grid2D, IntervalSet, VoxelGrid
+
+SIDES = [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+
+
+def random_points(rng: Random, count: int, extent: int) -> set[tuple[int, int, int]]:
+    return {tuple(rng.randrange(-extent, extent) for _ in range(3)) for _ in range(count)}
+
+
+def random_intervals(rng: Random, count: int) -> list[tuple[int, int]]:
+    """Intervals within [-20, 20), empty and reversed ones among them"""
+    return [(start, start + rng.randint(-2, 8)) for start in (rng.randrange(-20, 15) for _ in range(count))]
+
+
+def covered(intervals) -> set[int]:
+    return {value for start, end in intervals for value in range(start, end)}
+
+
+def side_of(point: tuple[int, int, int], side: tuple[int, int, int]) -> tuple[int, int, int]:
+    return tuple(coordinate + step for coordinate, step in zip(point, side))
+
+
+def test_grid_parse():
+    grid = Grid2D.parse("#..\n.#.\n..#\n.##\n", bytes.maketrans(b'.#', b'\x00\x01'))
+
+    assert (grid.width, grid.height, len(grid)) == (3, 4, 12)
+    assert [grid[x, x] for x in range(3)] == [1, 1, 1]
+    assert bytes(grid.row(3)) == b'\x00\x01\x01'
+    assert bytes(grid.column(0)) == b'\x01\x00\x00\x00'
+
+    assert Grid2D.parse(b"ab\ncd")[1, 1] == ord('d')
+
+
+def test_grid_rejects_uneven_rows_and_cells():
+    with pytest.raises(ValueError):
+        Grid2D.parse("..\n...")
+
+    with pytest.raises(ValueError):
+        Grid2D(3, 2, bytearray(5))
+
+
+def test_grid_cells_by_position_and_index():
+    grid = Grid2D(4, 3, fill=7)
+    grid[2, 1] = 9
+
+    assert grid.cells[grid.index(2, 1)] == 9
+    assert grid[1, 2] == 7
+    for index in range(len(grid)):
+        assert grid.index(*grid.position(index)) == index
+
+    assert grid.contains(3, 2) and not grid.contains(4, 0) and not grid.contains(0, -1)
+
+
+def test_grid_rows_and_columns_are_views():
+    grid = Grid2D(3, 3)
+    grid.row(1)[2] = 5
+    grid.column(0)[2] = 6
+
+    assert grid[2, 1] == 5
+    assert grid[0, 2] == 6
+
+
+@pytest.mark.parametrize('width, height', [(1, 1), (1, 4), (4, 1), (3, 5)])
+def test_grid_neighbours(width, height):
+    grid = Grid2D(width, height)
+
+    for index in range(len(grid)):
+        x, y = grid.position(index)
+        around = [(x + dx, y + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+        in_grid = {grid.index(*position) for position in around if grid.contains(*position)}
+
+        assert sorted(grid.neighbours8(index)) == sorted(in_grid)
+        assert sorted(grid.neighbours(index)) == sorted(
+            grid.index(*position) for position in around
+            if grid.contains(*position) and (position[0] == x or position[1] == y)
+        )
+
+
+def test_voxels_from_points():
+    grid = VoxelGrid.from_points([(1, 2, 3), (4, 2, 0)], value=2, padding=1)
+
+    assert grid.origin == (0, 1, -1)
+    assert grid.size == (6, 3, 6)
+    assert len(grid) == 108
+    assert grid.strides == (1, 6, 18)
+    assert grid[1, 2, 3] == grid[4, 2, 0] == 2
+    assert sum(grid.cells) == 4
+    assert grid.contains(0, 1, -1) and grid.contains(5, 3, 4)
+    assert not grid.contains(6, 1, 0) and not grid.contains(0, 0, 0)
+
+    with pytest.raises(ValueError):
+        VoxelGrid.from_points([])
+
+
+def test_voxel_bits():
+    points = random_points(Random(1), 30, 4)
+    grid = VoxelGrid.from_points(points)
+    grid[next(iter(points))] = 3
+
+    bits = grid.bits()
+    assert {index for index in range(len(grid)) if bits >> index & 1} \
+        == {grid.index(*point) for point in points} - {grid.index(*next(iter(points)))}
+    assert grid.bits(3).bit_count() == 1
+    assert grid.bits(0).bit_count() == len(grid) - len(points)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_voxel_surface_areas(seed):
+    points = random_points(Random(seed), 200, 5)
+    grid = VoxelGrid.from_points(points)
+
+    faces = [side_of(point, side) for point in points for side in SIDES]
+    assert grid.surface_area(grid.bits()) == sum(face not in points for face in faces)
+
+    # Air reached from the corner of the box, going around the points
+    low = grid.origin
+    high = tuple(coordinate + length - 1 for coordinate, length in zip(grid.origin, grid.size))
+    outside = {low}
+    queue = deque([low])
+    while queue:
+        point = queue.popleft()
+        for side in SIDES:
+            neighbour = side_of(point, side)
+            if neighbour not in outside and neighbour not in points \
+                    and all(lowest <= coordinate <= highest for coordinate, lowest, highest in zip(neighbour, low, high)):
+                outside.add(neighbour)
+                queue.append(neighbour)
+
+    reached = grid.flood_fill(grid.index(*low), grid.bits(0))
+    assert reached == sum(1 << grid.index(*point) for point in outside)
+    assert grid.surface_area(grid.bits() | (grid.bits(0) & ~reached)) == sum(face in outside for face in faces)
+
+
+def test_intervals_merge_when_overlapping_or_touching():
+    intervals = IntervalSet([(5, 8), (0, 2), (2, 3), (7, 10), (12, 12), (15, 13)])
+
+    assert list(intervals) == [(0, 3), (5, 10)]
+    assert len(intervals) == 2 and intervals.length == 8
+    assert repr(intervals) == "IntervalSet([(0, 3), (5, 10)])"
+    assert not IntervalSet() and intervals
+
+    intervals.add(3, 5)
+    assert intervals == IntervalSet([(0, 10)])
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_intervals_match_sets(seed):
+    rng = Random(seed)
+    intervals = random_intervals(rng, rng.randint(0, 10))
+    other_intervals = random_intervals(rng, rng.randint(0, 10))
+    values, other_values = covered(intervals), covered(other_intervals)
+
+    added = IntervalSet()
+    for start, end in intervals:
+        added.add(start, end)
+
+    interval_set, other = IntervalSet(intervals), IntervalSet(other_intervals)
+    assert added == interval_set
+    assert covered(interval_set) == values
+    assert interval_set.length == len(values)
+    # Sorted, and neither overlapping nor touching
+    assert all(start < end < next_start for (start, end), (next_start, _) in zip(interval_set, list(interval_set)[1:]))
+
+    assert covered(interval_set | other) == values | other_values
+    assert covered(interval_set & other) == values & other_values
+    assert interval_set.issuperset(other) == (values >= other_values)
+    assert interval_set.isdisjoint(other) == values.isdisjoint(other_values)
+
+    for start, end in random_intervals(rng, 20):
+        query = set(range(start, end))
+        assert interval_set.covers(start, end) == (query <= values)
+        assert interval_set.overlaps(start, end) == bool(query & values)
+        assert covered(interval_set.complement(start, end)) == query - values
+        assert interval_set.first_gap(start, end) == min(query - values, default=None)
+        assert (start in interval_set) == (start in values)
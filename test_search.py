@@ -0,0 +1,369 @@
+import itertools
+import math
+from collections import deque
+from dataclasses import dataclass
+from random import Random
+from typing import NamedTuple
+
+import pytest
+
+from search import (
+    Graph, PathNotFoundError, SearchStats, SharedIncumbent, a_star, all_pairs_distances, branch_and_bound, breadth_first_distances,
+    dijkstra_distances, parallel_branch_and_bound, reverse_distances
+)
+
+# A small maze, # are walls
+MAZE = [
+    "S..#......",
+    ".#.#.####.",
+    ".#...#....",
+    ".####.#.#.",
+    "......#.#G",
+]
+
+
+def maze_cells(maze: list[str]) -> dict[tuple[int, int], str]:
+    return {(x, y): cell for y, row in enumerate(maze) for x, cell in enumerate(row)}
+
+
+def maze_neighbours(cells: dict[tuple[int, int], str]):
+    def neighbours(position: tuple[int, int]) -> list[tuple[int, int]]:
+        x, y = position
+        return [
+            neighbour for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            if cells.get(neighbour, '#') != '#'
+        ]
+
+    return neighbours
+
+
+def find(cells: dict[tuple[int, int], str], cell: str) -> tuple[int, int]:
+    return next(position for position, other in cells.items() if other == cell)
+
+
+def manhattan(goal: tuple[int, int]):
+    return lambda position: abs(position[0] - goal[0]) + abs(position[1] - goal[1])
+
+
+def breadth_first_length(start, goal, neighbours) -> float:
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbour in neighbours(node):
+            if neighbour not in distances:
+                distances[neighbour] = distances[node] + 1
+                queue.append(neighbour)
+
+    return distances.get(goal, math.inf)
+
+
+def random_maze(rng: Random, width: int, height: int) -> list[str]:
+    rows = [[rng.choice('....#') for _ in range(width)] for _ in range(height)]
+    rows[0][0], rows[-1][-1] = 'S', 'G'
+    return [''.join(row) for row in rows]
+
+
+def random_graph(rng: Random, size: int, edge_count: int) -> dict[int, dict[int, float]]:
+    """Directed edges with lengths between size nodes, some of which can't reach the others"""
+    edges: dict[int, dict[int, float]] = {node: {} for node in range(size)}
+    for _ in range(edge_count):
+        edges[rng.randrange(size)][rng.randrange(size)] = rng.randint(1, 9)
+
+    return edges
+
+
+def graph_distances(graph: Graph, distances) -> dict:
+    return {graph.nodes[node_id]: distance for node_id, distance in enumerate(distances) if distance != math.inf}
+
+
+class KnapsackState(NamedTuple):
+    """The items decided on so far, the weight taken and what it's worth"""
+    decided: int
+    weight: int
+    worth: int
+
+
+@dataclass(frozen=True)
+class KnapsackSearch:
+    """Which items of (weight, worth) to take without exceeding the capacity, best worth per weight first"""
+    items: tuple[tuple[int, int], ...]
+    capacity: int
+
+    @classmethod
+    def create(cls, rng: Random, item_count: int) -> 'KnapsackSearch':
+        items = [(rng.randint(1, 20), rng.randint(1, 30)) for _ in range(item_count)]
+        items.sort(key=lambda item: item[1] / item[0], reverse=True)
+        return cls(tuple(items), sum(weight for weight, _ in items) // 2)
+
+    def root(self) -> KnapsackState:
+        return KnapsackState(0, 0, 0)
+
+    def expand(self, state: KnapsackState) -> list[KnapsackState]:
+        if state.decided == len(self.items):
+            return []
+
+        weight, worth = self.items[state.decided]
+        skipped = KnapsackState(state.decided + 1, state.weight, state.worth)
+        if state.weight + weight > self.capacity:
+            return [skipped]
+
+        return [KnapsackState(state.decided + 1, state.weight + weight, state.worth + worth), skipped]
+
+    def worth(self, state: KnapsackState) -> int:
+        return state.worth
+
+    def bound(self, state: KnapsackState) -> float:
+        # The rest of the items in order, the last one that doesn't fit taken in part
+        worth, room = state.worth, self.capacity - state.weight
+        for weight, item_worth in self.items[state.decided:]:
+            if weight > room:
+                return worth + item_worth * room / weight
+
+            worth, room = worth + item_worth, room - weight
+
+        return worth
+
+    def dominance(self, state: KnapsackState) -> tuple[tuple[int, int], int]:
+        return (state.decided, state.weight), state.worth
+
+    def exhaustive(self) -> int:
+        return max(
+            sum(worth for _, worth in taken)
+            for count in range(len(self.items) + 1)
+            for taken in itertools.combinations(self.items, count)
+            if sum(weight for weight, _ in taken) <= self.capacity
+        )
+
+
+def test_a_star_maze():
+    cells = maze_cells(MAZE)
+    start, goal = find(cells, 'S'), find(cells, 'G')
+    path = a_star(start, goal, maze_neighbours(cells), manhattan(goal), lambda node, neighbour: 1)
+
+    assert path.length == breadth_first_length(start, goal, maze_neighbours(cells)) == 17
+    # The path is the nodes before the goal, one step apart
+    assert path.nodes[0] == start
+    assert len(path.nodes) == path.length
+    for node, next_node in itertools.pairwise([*path.nodes, goal]):
+        assert next_node in maze_neighbours(cells)(node)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_a_star_matches_breadth_first(seed):
+    cells = maze_cells(random_maze(Random(seed), 12, 9))
+    start, goal = find(cells, 'S'), find(cells, 'G')
+    expected = breadth_first_length(start, goal, maze_neighbours(cells))
+
+    if expected == math.inf:
+        with pytest.raises(PathNotFoundError):
+            a_star(start, goal, maze_neighbours(cells), manhattan(goal), lambda node, neighbour: 1)
+    else:
+        path = a_star(start, goal, maze_neighbours(cells), manhattan(goal), lambda node, neighbour: 1)
+        assert path.length == expected
+
+
+def test_a_star_reaches_nodes_again_more_cheaply():
+    # Without a heuristic the detour through b is popped after c was pushed through the costly edge
+    edges = {'a': {'b': 1, 'c': 5}, 'b': {'c': 1}, 'c': {'d': 1}, 'd': {}}
+    path = a_star('a', 'd', edges.__getitem__, lambda node: 0, lambda node, neighbour: edges[node][neighbour])
+
+    assert path.nodes == ['a', 'b', 'c']
+    assert path.length == 3
+
+
+def test_a_star_nodes_need_not_be_comparable():
+    class Node:
+        def __init__(self, neighbours: list['Node']):
+            self.neighbours = neighbours
+
+    goal = Node([])
+    middle = [Node([goal]) for _ in range(3)]
+    start = Node(middle)
+
+    path = a_star(start, goal, lambda node: node.neighbours, lambda node: 0, lambda node, neighbour: 1)
+    assert path.length == 2
+
+
+def test_graph_numbers_given_nodes_first():
+    edges = {'c': ['a'], 'a': ['b'], 'b': ['c', 'd'], 'd': []}
+    graph = Graph.from_neighbours(['b', 'c'], edges.__getitem__)
+
+    assert graph.nodes == ('b', 'c', 'd', 'a')
+    assert graph.ids == {'b': 0, 'c': 1, 'd': 2, 'a': 3}
+    assert graph.size == 4
+    assert graph.weights is None
+    assert [graph.nodes[node_id] for node_id in graph.neighbours(graph.ids['b'])] == ['c', 'd']
+    assert list(graph.neighbours(graph.ids['d'])) == []
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_graph_searches_match_searches_on_nodes(seed):
+    rng = Random(seed)
+    edges = random_graph(rng, 30, 60)
+    neighbours, distance = edges.__getitem__, lambda node, neighbour: edges[node][neighbour]
+    unweighted = Graph.from_neighbours(edges, neighbours)
+    weighted = Graph.from_neighbours(edges, neighbours, distance)
+    sources = rng.sample(range(30), 2)
+
+    assert graph_distances(unweighted, unweighted.breadth_first_distances(sources)) \
+        == breadth_first_distances(sources, neighbours)
+    assert graph_distances(weighted, weighted.dijkstra_distances(sources)) \
+        == dijkstra_distances(sources, neighbours, distance)
+    # Without weights every edge is one step
+    assert graph_distances(unweighted, unweighted.dijkstra_distances(sources)) \
+        == breadth_first_distances(sources, neighbours)
+
+    start_id = weighted.ids[sources[0]]
+    for goal in rng.sample(range(30), 5):
+        try:
+            expected = a_star(sources[0], goal, neighbours, lambda node: 0, distance).length
+        except PathNotFoundError:
+            with pytest.raises(PathNotFoundError):
+                weighted.a_star(start_id, weighted.ids[goal], lambda node_id: 0)
+            continue
+
+        assert weighted.a_star(start_id, weighted.ids[goal], lambda node_id: 0).length == expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_reversed_graph(seed):
+    rng = Random(seed)
+    edges = random_graph(rng, 20, 40)
+    distance = lambda node, neighbour: edges[node][neighbour]
+    graph = Graph.from_neighbours(edges, edges.__getitem__, distance)
+    reversed_graph = graph.reversed()
+    predecessors = {node: [other for other in edges if node in edges[other]] for node in edges}
+    goals = rng.sample(range(20), 2)
+
+    assert reversed_graph.nodes == graph.nodes
+    assert graph_distances(reversed_graph, reversed_graph.dijkstra_distances(goals)) \
+        == reverse_distances(goals, predecessors.__getitem__, distance)
+
+    twice = reversed_graph.reversed()
+    for node_id in range(graph.size):
+        edges_of = lambda some_graph: sorted(
+            (some_graph.targets[edge], some_graph.weights[edge])
+            for edge in range(some_graph.offsets[node_id], some_graph.offsets[node_id + 1])
+        )
+        assert edges_of(twice) == edges_of(graph)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+def test_all_pairs_distances(weighted):
+    edges = random_graph(Random(7), 25, 60)
+    neighbours = edges.__getitem__
+    distance = (lambda node, neighbour: edges[node][neighbour]) if weighted else None
+    # Paths may pass through nodes outside the table
+    nodes = list(range(0, 25, 2))
+    table = all_pairs_distances(nodes, neighbours, distance)
+
+    for node in nodes:
+        expected = dijkstra_distances([node], neighbours, distance or (lambda node, neighbour: 1))
+        assert [table[node, other] for other in nodes] == [expected.get(other, math.inf) for other in nodes]
+
+    assert all_pairs_distances(nodes, neighbours, distance) is table
+
+
+def test_stats_count_the_work_of_a_search():
+    # c is first pushed through the costly edge and popped again after the detour through b settled it
+    edges = {'a': {'b': 1, 'c': 5}, 'b': {'c': 1}, 'c': {}}
+    stats = SearchStats()
+    dijkstra_distances(['a'], edges.__getitem__, lambda node, neighbour: edges[node][neighbour], stats)
+
+    assert (stats.searches, stats.expanded, stats.relaxed, stats.stale) == (1, 3, 3, 1)
+    assert (stats.peak_frontier, stats.peak_g_score) == (2, 3)
+    assert stats.elapsed > 0
+
+
+def test_stats_total_searches_with_peaks_of_the_highest():
+    line = {node: [node + 1] for node in range(9)} | {9: []}
+    stats = SearchStats()
+    breadth_first_distances([0], line.__getitem__, stats)
+    breadth_first_distances([5], line.__getitem__, stats)
+
+    assert (stats.searches, stats.expanded, stats.relaxed) == (2, 15, 13)
+    assert (stats.peak_frontier, stats.peak_g_score) == (1, 10)
+
+    graph = Graph.from_neighbours(line, line.__getitem__)
+    graph_stats = SearchStats()
+    graph.breadth_first_distances([0], graph_stats)
+    assert (graph_stats.expanded, graph_stats.relaxed, graph_stats.peak_g_score) == (10, 9, 10)
+
+    stats.add(graph_stats)
+    assert (stats.searches, stats.expanded, stats.relaxed, stats.peak_g_score) == (3, 25, 22, 10)
+    assert stats.elapsed >= graph_stats.elapsed
+
+
+@pytest.mark.parametrize('order', ['dfs', 'best'])
+@pytest.mark.parametrize('use_dominance', [False, True])
+@pytest.mark.parametrize('seed', range(8))
+def test_branch_and_bound_matches_exhaustive(order, use_dominance, seed):
+    search = KnapsackSearch.create(Random(seed), 14)
+    stats = SearchStats()
+    dominance = search.dominance if use_dominance else None
+    best_state, best_worth = branch_and_bound(
+        search.root(), search.expand, search.worth, search.bound, dominance, order=order, stats=stats
+    )
+
+    assert best_worth == search.exhaustive()
+    assert best_state.worth == best_worth
+    assert best_state.weight <= search.capacity
+    assert stats.searches == 1 and stats.pruned > 0
+    if use_dominance:
+        assert stats.peak_g_score > 1
+
+
+def test_branch_and_bound_keeps_an_incumbent_it_cant_beat():
+    search = KnapsackSearch.create(Random(0), 10)
+    best = search.exhaustive()
+
+    assert branch_and_bound(search.root(), search.expand, search.worth, search.bound, incumbent=best) == (None, best)
+    assert branch_and_bound(search.root(), search.expand, search.worth, search.bound, incumbent=best - 1)[1] == best
+
+
+def test_branch_and_bound_rejects_unknown_orders():
+    search = KnapsackSearch.create(Random(0), 3)
+    with pytest.raises(ValueError):
+        branch_and_bound(search.root(), search.expand, search.worth, search.bound, order='bfs')
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_parallel_branch_and_bound_matches_exhaustive(workers, seed):
+    search = KnapsackSearch.create(Random(seed), 16)
+    stats = SearchStats()
+    best_state, best_worth = parallel_branch_and_bound(
+        search.root(), search.expand, search.worth, search.bound, search.dominance, workers=workers, stats=stats
+    )
+
+    assert best_worth == search.exhaustive()
+    assert best_state.worth == best_worth
+    # The split below the root and a search of every subtree that could beat the best found while splitting
+    assert stats.searches > 1
+
+
+def test_parallel_branch_and_bound_without_subtrees_to_search():
+    # Every item is decided before there are enough subtrees for the pool
+    search = KnapsackSearch.create(Random(0), 2)
+    stats = SearchStats()
+    _, best_worth = parallel_branch_and_bound(
+        search.root(), search.expand, search.worth, search.bound, workers=4, stats=stats
+    )
+
+    assert best_worth == search.exhaustive()
+    assert stats.searches == 1
+
+
+def test_shared_incumbent_keeps_the_best_offer():
+    shared = SharedIncumbent()
+    assert shared.get() == -math.inf
+
+    shared.offer(5)
+    shared.offer(3)
+    assert shared.get() == 5
+
+    # A second handle on the same value, as the workers of a pool get
+    other = SharedIncumbent(shared.value)
+    other.offer(8)
+    assert shared.get() == 8